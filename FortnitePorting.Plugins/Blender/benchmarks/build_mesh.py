@@ -0,0 +1,78 @@
+"""Times build_mesh against Mesh.from_pydata on a synthetic high-poly grid.
+
+Runs inside Blender:
+    blender --background --factory-startup --python benchmarks/build_mesh.py -- --size 1000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from io_scene_ueformat.importer.utils import build_mesh  # noqa: E402
+
+
+# a size x size grid of quads split into triangles, laid out like an imported lod
+def make_grid(size):
+    x, y = np.meshgrid(np.arange(size, dtype=np.float32), np.arange(size, dtype=np.float32))
+    z = np.sin(x * 0.1) * np.cos(y * 0.1)
+    vertices = np.stack((x.ravel(), y.ravel(), z.ravel()), axis=1)
+
+    corners = (np.arange(size - 1)[None, :] + np.arange(size - 1)[:, None] * size).ravel()
+    indices = np.concatenate((
+        np.stack((corners, corners + 1, corners + size + 1), axis=1),
+        np.stack((corners, corners + size + 1, corners + size), axis=1),
+    )).astype(np.int32)
+
+    return vertices, indices
+
+
+def time_build_mesh(vertices, indices):
+    mesh_data = bpy.data.meshes.new("BuildMesh")
+    start_time = time.perf_counter()
+    build_mesh(mesh_data, vertices, indices)
+    return mesh_data, time.perf_counter() - start_time
+
+
+# what the importer did before build_mesh
+def time_from_pydata(vertices, indices):
+    mesh_data = bpy.data.meshes.new("FromPydata")
+    start_time = time.perf_counter()
+    mesh_data.from_pydata(vertices, [], indices)
+    mesh_data.update()
+    return mesh_data, time.perf_counter() - start_time
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=1000, help="grid width in vertices")
+    args = parser.parse_args(argv)
+
+    vertices, indices = make_grid(args.size)
+
+    new_mesh, new_time = time_build_mesh(vertices, indices)
+    old_mesh, old_time = time_from_pydata(vertices, indices)
+
+    try:
+        if len(new_mesh.vertices) != len(old_mesh.vertices) or len(new_mesh.polygons) != len(old_mesh.polygons):
+            print(f"Mismatch: build_mesh made {len(new_mesh.vertices)} vertices and {len(new_mesh.polygons)} faces, "
+                  f"from_pydata made {len(old_mesh.vertices)} vertices and {len(old_mesh.polygons)} faces")
+            return 1
+
+        print(f"{len(vertices)} vertices, {len(indices)} faces")
+        print(f"from_pydata: {old_time:.3f}s")
+        print(f"build_mesh: {new_time:.3f}s ({old_time / max(new_time, 1e-9):.1f}x)")
+        return 0
+    finally:
+        bpy.data.meshes.remove(new_mesh)
+        bpy.data.meshes.remove(old_mesh)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
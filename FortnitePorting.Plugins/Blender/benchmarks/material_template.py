@@ -0,0 +1,160 @@
+"""Checks that a material copied from a template ends up with the same node tree as one built from scratch.
+
+Runs inside Blender with the Rivals Porting extension enabled:
+    blender --background --python benchmarks/material_template.py
+"""
+
+import importlib
+import sys
+
+import bpy
+
+
+def find_import_context():
+    addon = next((name for name in bpy.context.preferences.addons.keys() if name.split(".")[-1] == "rivals_porting"), None)
+    if addon is None:
+        return None
+
+    return importlib.import_module(f"{addon}.processing.import_context")
+
+
+def make_material_data(name, material_hash, texture_suffix, roughness, tint):
+    def texture(param_name, texture_name, srgb):
+        return {"Name": param_name, "Value": f"/Game/Check/{texture_name}.{texture_name}", "sRGB": srgb}
+
+    return {
+        "Name": name,
+        "Hash": material_hash,
+        "OverrideBlendMode": 0,
+        "BaseBlendMode": 0,
+        "TranslucencyLightingMode": 0,
+        "ShadingModel": 1,
+        "BaseMaterialPath": "/Game/Check/M_Check",
+        "PhysMaterialName": "",
+        "Textures": [
+            texture("Diffuse", f"T_Check{texture_suffix}_D", True),
+            texture("M", f"T_Check{texture_suffix}_M", False),
+            texture("UnusedTexture", f"T_Check{texture_suffix}_U", False),
+        ],
+        "Scalars": [
+            {"Name": "Roughness", "Value": roughness},
+            {"Name": "UnusedScalar", "Value": roughness * 2},
+        ],
+        "Vectors": [
+            {"Name": "UnusedVector", "Value": {"R": tint[0], "G": tint[1], "B": tint[2], "A": 1.0}},
+        ],
+        "Switches": [],
+        "ComponentMasks": [],
+    }
+
+
+def describe_value(value):
+    if hasattr(value, "__len__") and not isinstance(value, str):
+        return tuple(round(item, 5) for item in value)
+    if isinstance(value, float):
+        return round(value, 5)
+    return value
+
+
+def describe_sockets(sockets):
+    return tuple(describe_value(socket.default_value) if hasattr(socket, "default_value") else None for socket in sockets)
+
+
+# with_values leaves out everything the import patches per material so a template and its copy can be compared
+def describe_tree(node_tree, with_values=True):
+    nodes = {}
+    for node in node_tree.nodes:
+        description = [
+            node.bl_idname,
+            node.label,
+            node.hide,
+            describe_value(node.location),
+            node.node_tree.name if getattr(node, "node_tree", None) else None,
+        ]
+        if with_values:
+            description += [
+                node.image.name if getattr(node, "image", None) else None,
+                describe_sockets(node.inputs),
+                describe_sockets(node.outputs),
+            ]
+        nodes[node.name] = tuple(description)
+
+    links = {
+        (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+        for link in node_tree.links
+    }
+    return nodes, links
+
+
+def compare_trees(label, expected, actual):
+    expected_nodes, expected_links = expected
+    actual_nodes, actual_links = actual
+
+    differences = []
+    for name in sorted(expected_nodes.keys() | actual_nodes.keys()):
+        if expected_nodes.get(name) != actual_nodes.get(name):
+            differences.append(f"  node {name}: {expected_nodes.get(name)} != {actual_nodes.get(name)}")
+    for node_link in sorted(expected_links ^ actual_links):
+        side = "missing" if node_link in expected_links else "extra"
+        differences.append(f"  {side} link {node_link}")
+
+    if differences:
+        print(f"{label}: {len(differences)} differences")
+        print("\n".join(differences))
+        return False
+
+    print(f"{label}: {len(actual_nodes)} nodes and {len(actual_links)} links match")
+    return True
+
+
+def main():
+    if (import_context := find_import_context()) is None:
+        print("The Rivals Porting extension isn't enabled")
+        return 1
+
+    images = [bpy.data.images.new(f"T_Check{suffix}_{kind}", 4, 4) for suffix in ["A", "B"] for kind in "DMU"]
+
+    context = import_context.ImportContext({"Settings": {"ImageFormat": 0}, "AssetsRoot": ""})
+    context.type = import_context.EExportType.NONE
+    context.override_parameters = []
+    context.full_vertex_crunch_materials = []
+    context.partial_vertex_crunch_materials = {}
+    context.add_toon_outline = False
+    context.material_index = None
+    context.material_templates = {}
+    context.material_template_keys = {}
+    context.image_paths = {}
+    import_context.ensure_blend_data()
+
+    built = []
+
+    def build(material_data):
+        existing = set(bpy.data.materials)
+        context.import_material(None, material_data, {}, True)
+        material = next(material for material in bpy.data.materials if material not in existing)
+        built.append(material)
+        return material
+
+    try:
+        template = build(make_material_data("CheckTemplate", 1, "A", 0.25, (1.0, 0.0, 0.0)))
+        clone = build(make_material_data("CheckClone", 2, "B", 0.75, (0.0, 1.0, 0.0)))
+
+        # build the clone's material again without any templates to get what it should look like
+        context.material_templates.clear()
+        context.material_template_keys.clear()
+        fresh = build(make_material_data("CheckFresh", 3, "B", 0.75, (0.0, 1.0, 0.0)))
+
+        matches = [
+            compare_trees("template and copy", describe_tree(template.node_tree, False), describe_tree(clone.node_tree, False)),
+            compare_trees("copy and fresh build", describe_tree(fresh.node_tree), describe_tree(clone.node_tree)),
+        ]
+        return 0 if all(matches) else 1
+    finally:
+        for material in built:
+            bpy.data.materials.remove(material)
+        for image in images:
+            bpy.data.images.remove(image)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
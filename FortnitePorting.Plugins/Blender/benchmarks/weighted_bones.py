@@ -0,0 +1,94 @@
+"""Times the weighted-bone set used for bone colors against the old per-bone vertex scan.
+
+Runs without Blender:
+    python benchmarks/weighted_bones.py --bones 600 --vertices 20000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from io_scene_ueformat.importer.classes import WEIGHT_DTYPE, UEModelLOD  # noqa: E402
+
+
+def make_lod(bone_count, vertex_count, influences, seed):
+    rng = np.random.default_rng(seed)
+
+    # the last tenth of the skeleton has no influences, like the ik and twist bones of a game rig
+    weighted_count = max(1, bone_count - bone_count // 10)
+    weights = np.zeros(vertex_count * influences, dtype=WEIGHT_DTYPE)
+    weights["vertex_index"] = np.repeat(np.arange(vertex_count), influences)
+    # each bone deforms a contiguous run of vertices, so finding a bone's first vertex means scanning up to it
+    region_bones = weights["vertex_index"] * weighted_count // vertex_count
+    weights["bone_index"] = np.clip(region_bones + rng.integers(-2, 3, len(weights)), 0, weighted_count - 1)
+    weights["weight"] = rng.uniform(0.05, 1.0, len(weights))
+
+    return UEModelLOD(name="LOD0", weights=weights)
+
+
+# vertex groups are created in the order bones first appear in the weights, as build_mesh does
+def make_vertex_groups(lod, vertex_count):
+    group_indices = {}
+    vertex_groups = [[] for _ in range(vertex_count)]
+    for bone_index, vertex_index in zip(lod.weights["bone_index"].tolist(), lod.weights["vertex_index"].tolist()):
+        group_index = group_indices.setdefault(bone_index, len(group_indices))
+        if group_index not in vertex_groups[vertex_index]:
+            vertex_groups[vertex_index].append(group_index)
+
+    return group_indices, vertex_groups
+
+
+# what has_vertex_weights did: every bone that has a group scans the groups of every vertex until it finds itself
+def old_weighted_bones(bone_count, group_indices, vertex_groups):
+    weighted = set()
+    for bone_index in range(bone_count):
+        if (group_index := group_indices.get(bone_index)) is None:
+            continue
+
+        if any(group_index in [group for group in groups] for groups in vertex_groups):
+            weighted.add(bone_index)
+
+    return weighted
+
+
+def new_weighted_bones(lod):
+    return set(lod.get_weighted_bone_indices().tolist())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bones", type=int, default=600)
+    parser.add_argument("--vertices", type=int, default=20000)
+    parser.add_argument("--influences", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    lod = make_lod(args.bones, args.vertices, args.influences, args.seed)
+
+    new_weighted_bones(lod)
+    start_time = time.perf_counter()
+    new = new_weighted_bones(lod)
+    new_time = time.perf_counter() - start_time
+
+    group_indices, vertex_groups = make_vertex_groups(lod, args.vertices)
+    start_time = time.perf_counter()
+    old = old_weighted_bones(args.bones, group_indices, vertex_groups)
+    old_time = time.perf_counter() - start_time
+
+    if new != old:
+        print(f"Mismatch: {len(new ^ old)} bones differ")
+        return 1
+
+    print(f"{args.bones} bones, {args.vertices} vertices, {len(lod.weights)} influences, {len(new)} weighted bones")
+    print(f"old per-bone scan: {old_time:.3f}s")
+    print(f"weighted-bone set: {new_time:.5f}s ({old_time / max(new_time, 1e-9):.0f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
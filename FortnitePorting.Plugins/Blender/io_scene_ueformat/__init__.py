@@ -1,6 +1,6 @@
-import zstandard as zstd
-
-from . import op
+from .importer.classes import UEAsset
+from .importer.parser import UEFormatParser
+from .importer.probe import UEFormatProbe, probe
 
 bl_info = {
     "name": "UE Format (.uemodel / .ueanim / .uepose)",
@@ -12,22 +12,16 @@ bl_info = {
 }
 
 
-global zstd_decompressor
-zstd_decompressor = zstd.ZstdDecompressor()
-
+# the operators pull in bpy, only import them when blender registers the addon so the parser can be used without it
 def register() -> None:
-    global zstd_decompressor  # noqa: PLW0603
-    zstd_decompressor = zstd.ZstdDecompressor()
-
+    from . import op
     op.register()
 
 
 def unregister() -> None:
+    from . import op
     op.unregister()
 
-    global zstd_decompressor  # noqa: PLW0603
-    del zstd_decompressor
-
 
 if __name__ == "__main__":
     register()
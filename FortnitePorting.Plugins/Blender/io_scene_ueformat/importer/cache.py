@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+from contextlib import suppress
+from enum import IntEnum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from ..importer import classes
+from ..importer.classes import EUEFormatVersion, UEAsset
+from ..logging import Log
+
+if TYPE_CHECKING:
+    from ..options import UEFormatOptions
+
+# bump whenever the parsed classes change shape so old entries stop matching
+CACHE_VERSION = 3
+CACHE_EXTENSION = ".uecache"
+HEADER_KEY = "header"
+# small arrays like bone transforms are written into the header instead of getting their own npz member
+INLINE_ARRAY_SIZE = 16
+
+# only the parsed classes can be rebuilt from a cache entry
+CACHE_TYPES: dict[str, type] = {
+    name: value for name, value in vars(classes).items()
+    if isinstance(value, type) and value.__module__ == classes.__name__
+    and (dataclasses.is_dataclass(value) or issubclass(value, IntEnum))
+}
+
+_caches: dict[tuple[str, int], AssetCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_asset_cache(directory: str | Path, size_limit: int) -> AssetCache:
+    key = (os.path.abspath(directory), size_limit)
+    with _caches_lock:
+        if (cache := _caches.get(key)) is None:
+            cache = _caches[key] = AssetCache(Path(key[0]), size_limit)
+        return cache
+
+
+# parsed assets written to disk as an uncompressed npz, the arrays are stored as they are and everything else goes
+# into a json header. nothing is pickled so a cache entry can't run code when it's loaded.
+# entries are evicted least recently used first once the size limit is reached
+class AssetCache:
+    def __init__(self, directory: Path, size_limit: int) -> None:
+        self.directory = directory
+        self.size_limit = size_limit
+        self.total_size: int | None = None
+        self.lock = threading.Lock()
+
+    def entry_path(self, path: Path, options: UEFormatOptions) -> Path:
+        stat = path.stat()
+        key = repr((
+            CACHE_VERSION,
+            int(EUEFormatVersion.LatestVersion),
+            os.path.abspath(path),
+            stat.st_size,
+            stat.st_mtime_ns,
+            options.scale_factor,
+            # models only keep the lod they were parsed for
+            getattr(options, "target_lod", None),
+        ))
+        return self.directory / (hashlib.sha1(key.encode()).hexdigest() + CACHE_EXTENSION)
+
+    def get(self, entry: Path) -> UEAsset | None:
+        try:
+            with np.load(entry, allow_pickle=False) as archive:
+                header = json.loads(archive[HEADER_KEY].tobytes())
+                asset = decode_value(header, archive)
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # noqa: BLE001
+            Log.warn(f"Discarding unreadable cache entry {entry.name}: {e}")
+            self.remove(entry)
+            return None
+
+        if not isinstance(asset, UEAsset):
+            self.remove(entry)
+            return None
+
+        # bump the access time used for eviction
+        with suppress(OSError):
+            os.utime(entry)
+        return asset
+
+    def put(self, entry: Path, asset: UEAsset) -> None:
+        arrays: dict[str, np.ndarray] = {}
+        try:
+            header = json.dumps(encode_value(asset, arrays)).encode()
+        except (TypeError, ValueError) as e:
+            Log.warn(f"Failed to write cache entry {entry.name}: {e}")
+            return
+
+        arrays[HEADER_KEY] = np.frombuffer(header, dtype=np.uint8)
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            try:
+                replaced_size = entry.stat().st_size
+            except FileNotFoundError:
+                replaced_size = 0
+
+            temp_entry = entry.with_name(f"{entry.name}.{threading.get_ident()}.tmp")
+            with temp_entry.open("wb") as file:
+                np.savez(file, **arrays)
+            os.replace(temp_entry, entry)
+            size = entry.stat().st_size
+        except (OSError, ValueError) as e:
+            Log.warn(f"Failed to write cache entry {entry.name}: {e}")
+            return
+
+        with self.lock:
+            if self.total_size is None:
+                self.total_size = sum(file.stat().st_size for file in self.entries())
+            else:
+                self.total_size += size - replaced_size
+
+            if self.total_size > self.size_limit:
+                self.evict()
+
+    def remove(self, entry: Path) -> None:
+        with suppress(OSError):
+            entry.unlink()
+
+    def entries(self) -> list[Path]:
+        return list(self.directory.glob(f"*{CACHE_EXTENSION}"))
+
+    def evict(self) -> None:
+        entries = []
+        for entry in self.entries():
+            try:
+                entries.append((entry.stat(), entry))
+            except OSError:
+                continue
+
+        entries.sort(key=lambda item: item[0].st_mtime_ns)
+        total_size = sum(stat.st_size for stat, _ in entries)
+        for stat, entry in entries:
+            if total_size <= self.size_limit:
+                break
+            self.remove(entry)
+            total_size -= stat.st_size
+
+        self.total_size = total_size
+
+
+def encode_value(value: Any, arrays: dict[str, np.ndarray]) -> Any:
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, IntEnum):
+        return {"enum": type(value).__name__, "value": int(value)}
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            msg = "Object arrays can't be cached"
+            raise TypeError(msg)
+        if value.dtype.names is None and value.size <= INLINE_ARRAY_SIZE:
+            return {"inline": value.dtype.str, "shape": list(value.shape), "values": value.ravel().tolist()}
+
+        key = f"array_{len(arrays)}"
+        arrays[key] = value
+        return {"array": key}
+    if isinstance(value, (list, tuple)):
+        items = [encode_value(item, arrays) for item in value]
+        return items if isinstance(value, list) else {"tuple": items}
+    if dataclasses.is_dataclass(value) and CACHE_TYPES.get(type(value).__name__) is type(value):
+        return {
+            "type": type(value).__name__,
+            "fields": {field.name: encode_value(getattr(value, field.name), arrays) for field in dataclasses.fields(value)},
+        }
+
+    msg = f"Can't cache values of type {type(value).__name__}"
+    raise TypeError(msg)
+
+
+def decode_value(value: Any, archive: Any) -> Any:
+    if isinstance(value, list):
+        return [decode_value(item, archive) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    if "array" in value:
+        return archive[value["array"]]
+    if "inline" in value:
+        return np.array(value["values"], dtype=np.dtype(value["inline"])).reshape(value["shape"])
+    if "tuple" in value:
+        return tuple(decode_value(item, archive) for item in value["tuple"])
+    if "enum" in value:
+        return CACHE_TYPES[value["enum"]](value["value"])
+    if "type" in value:
+        cls = CACHE_TYPES[value["type"]]
+        return cls(**{name: decode_value(field, archive) for name, field in value["fields"].items()})
+
+    msg = f"Unknown cache value {value}"
+    raise ValueError(msg)
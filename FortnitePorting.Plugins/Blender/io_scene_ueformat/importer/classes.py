@@ -6,7 +6,6 @@ from typing import TYPE_CHECKING, Any
 
 import numpy as np
 import numpy.typing as npt
-from mathutils import Quaternion, Vector
 
 from ..logging import Log
 
@@ -19,6 +18,11 @@ MODEL_IDENTIFIER = "UEMODEL"
 ANIM_IDENTIFIER = "UEANIM"
 POSE_IDENTIFIER = "UEPOSE"
 
+WEIGHT_DTYPE = np.dtype([("bone_index", np.int16), ("vertex_index", np.int32), ("weight", np.float32)])
+MORPH_DELTA_DTYPE = np.dtype([("position", np.float32, 3), ("normal", np.float32, 3), ("vertex_index", np.int32)])
+VECTOR_KEY_DTYPE = np.dtype([("frame", np.int32), ("value", np.float32, 3)])
+QUAT_KEY_DTYPE = np.dtype([("frame", np.int32), ("value", np.float32, 4)])
+
 
 class EUEFormatVersion(IntEnum):
     BeforeCustomVersionWasAdded = 0
@@ -36,17 +40,78 @@ class EUEFormatVersion(IntEnum):
     LatestVersion = VersionPlusOne - 1
 
 
+@dataclass(slots=True)
+class UEFormatHeader:
+    identifier: str
+    name: str
+    file_version: EUEFormatVersion
+    compression_type: str | None = None
+    uncompressed_size: int | None = None
+    compressed_size: int | None = None
+
+    @property
+    def is_compressed(self) -> bool:
+        return self.compression_type is not None
+
+    @classmethod
+    def from_archive(cls, ar: FArchiveReader) -> UEFormatHeader:
+        magic = ar.read_string(len(MAGIC))
+        if magic != MAGIC:
+            msg = "Invalid magic"
+            raise ValueError(msg)
+
+        identifier = ar.read_fstring()
+        file_version = EUEFormatVersion(int.from_bytes(ar.read_byte(), byteorder="big"))
+        if file_version > EUEFormatVersion.LatestVersion:
+            msg = f"File Version {file_version} is not supported for this version of the importer."
+            Log.error(msg)
+            raise ValueError(msg)
+
+        data = cls(identifier=identifier, name=ar.read_fstring(), file_version=file_version)
+        if ar.read_bool():
+            data.compression_type = ar.read_fstring()
+            data.uncompressed_size = ar.read_int()
+            data.compressed_size = ar.read_int()
+        return data
+
+
+@dataclass(slots=True)
+class UEFormatSection:
+    name: str
+    array_size: int
+    byte_size: int
+    offset: int
+
+    @classmethod
+    def from_archive(cls, ar: FArchiveReader) -> UEFormatSection:
+        data = cls(name=ar.read_fstring(), array_size=ar.read_int(), byte_size=ar.read_int(), offset=0)
+        data.offset = ar.tell()
+        ar.skip(data.byte_size)
+        return data
+
+
+@dataclass(slots=True)
+class UEAsset:
+    identifier: str
+    name: str
+    file_version: EUEFormatVersion
+    data: UEModel | UEAnim | UEPose
+
+
 @dataclass(slots=True)
 class UEModel:
     lods: list[UEModelLOD] = field(default_factory=list)
+    lod_table: list[UEModelLODEntry] = field(default_factory=list)
     collisions: list[ConvexCollision] = field(default_factory=list)
     skeleton: UEModelSkeleton | None = None
     # physics = None  # noqa: ERA001
 
+    # when target_lod is set only that lod is read, the others are only added to lod_table
     @classmethod
     def from_archive(
         cls,
-        ar: FArchiveReader
+        ar: FArchiveReader,
+        target_lod: int | None = None,
     ) -> UEModel:
         data = cls()
 
@@ -57,7 +122,20 @@ class UEModel:
 
             match section_name:
                 case "LODS":
-                    data.lods = ar.read_array(array_size, lambda ar: UEModelLOD.from_archive(ar))
+                    section_end = ar.tell() + byte_size
+                    data.lod_table = ar.read_array(array_size, lambda ar: UEModelLODEntry.from_archive(ar))
+
+                    if target_lod is None:
+                        target_entries = data.lod_table
+                    else:
+                        target_entries = data.lod_table[min(target_lod, len(data.lod_table) - 1):][:1]
+
+                    data.lods = []
+                    for entry in target_entries:
+                        ar.seek(entry.offset)
+                        data.lods.append(UEModelLOD.from_archive(ar))
+
+                    ar.seek(section_end)
                 case "SKELETON":
                     data.skeleton = UEModelSkeleton.from_archive(ar.chunk(byte_size))
                 case "COLLISION":
@@ -81,21 +159,19 @@ class UEModel:
             array_size = ar.read_int()
             byte_size = ar.read_int()
 
-            pos = ar.data.tell()
+            pos = ar.tell()
             if header_name == "VERTICES":
-                flattened = ar.read_float_vector(array_size * 3)
-                lod.vertices = (np.array(flattened) * ar.metadata["scale"]).reshape(array_size, 3)
+                flattened = ar.read_float_array(array_size * 3)
+                lod.vertices = (flattened * ar.metadata["scale"]).reshape(array_size, 3)
             elif header_name == "INDICES":
-                lod.indices = np.array(ar.read_int_vector(array_size), dtype=np.int32).reshape(array_size // 3, 3)
+                lod.indices = ar.read_int_array(array_size).reshape(array_size // 3, 3).copy()
             elif header_name == "NORMALS":
                 if ar.file_version >= EUEFormatVersion.SerializeBinormalSign:
-                    flattened = np.array(
-                        ar.read_float_vector(array_size * 4),
-                    )  # W XYZ #  # noqa: TD002, FIX002, TD003
-                    lod.normals = flattened.reshape(-1, 4)[:, 1:]
+                    flattened = ar.read_float_array(array_size * 4)  # W XYZ #  # noqa: TD002, FIX002, TD003
+                    lod.normals = flattened.reshape(-1, 4)[:, 1:].copy()
                 else:
-                    flattened = np.array(ar.read_float_vector(array_size * 3)).reshape(array_size, 3)
-                    lod.normals = flattened
+                    flattened = ar.read_float_array(array_size * 3).reshape(array_size, 3)
+                    lod.normals = flattened.copy()
             elif header_name == "TANGENTS":
                 ar.skip(array_size * 3 * 3)
                 # flattened = np.array(ar.read_float_vector(array_size * 3)).reshape(array_size, 3)  # noqa: ERA001
@@ -106,20 +182,18 @@ class UEModel:
                     lod.colors = [
                         VertexColor(
                             "COL0",
-                            (np.array(ar.read_byte_vector(array_size * 4)).reshape(array_size, 4) / 255).astype(
-                                np.float32,
-                            ),
+                            ar.read_byte_array(array_size * 4).reshape(array_size, 4).astype(np.float32) / 255,
                         ),
                     ]
             elif header_name == "TEXCOORDS":
                 lod.uvs = []
                 for _ in range(array_size):
                     count = ar.read_int()
-                    lod.uvs.append(np.array(ar.read_float_vector(count * 2)).reshape(count, 2))
+                    lod.uvs.append(ar.read_float_array(count * 2).reshape(count, 2).copy())
             elif header_name == "MATERIALS":
                 lod.materials = ar.read_array(array_size, lambda ar: Material.from_archive(ar))
             elif header_name == "WEIGHTS":
-                lod.weights = ar.read_array(array_size, lambda ar: Weight.from_archive(ar))
+                lod.weights = ar.read_numpy_array(array_size, WEIGHT_DTYPE).copy()
             elif header_name == "MORPHTARGETS":
                 lod.morphs = ar.read_array(
                     array_size,
@@ -143,13 +217,28 @@ class UEModel:
             else:
                 Log.warn(f"Unknown Data: {header_name}")
                 ar.skip(byte_size)
-            ar.data.seek(pos + byte_size, 0)
+            ar.seek(pos + byte_size)
 
         data.lods.append(lod)
 
         return data
 
 
+@dataclass(slots=True)
+class UEModelLODEntry:
+    name: str
+    offset: int
+    size: int
+
+    @classmethod
+    def from_archive(cls, ar: FArchiveReader) -> UEModelLODEntry:
+        offset = ar.tell()
+        name = ar.read_fstring()
+        lod_size = ar.read_int()
+        ar.skip(lod_size)
+        return cls(name=name, offset=offset, size=ar.tell() - offset)
+
+
 @dataclass(slots=True)
 class UEModelLOD:
     name: str
@@ -161,7 +250,7 @@ class UEModelLOD:
     uvs: list[npt.NDArray[Any]] = field(default_factory=list)
     materials: list[Material] = field(default_factory=list)
     morphs: list[MorphTarget] = field(default_factory=list)
-    weights: list[Weight] = field(default_factory=list)
+    weights: npt.NDArray[np.void] = field(default_factory=lambda: np.zeros(0, dtype=WEIGHT_DTYPE))
 
     @classmethod
     def from_archive(
@@ -178,24 +267,21 @@ class UEModelLOD:
             array_size = ar.read_int()
             byte_size = ar.read_int()
 
-            pos = ar.data.tell()
+            pos = ar.tell()
 
             if header_name == "VERTICES":
-                flattened = ar.read_float_vector(array_size * 3)
-                data.vertices = (np.array(flattened) * ar.metadata["scale"]).reshape(array_size, 3)
+                flattened = ar.read_float_array(array_size * 3)
+                data.vertices = (flattened * ar.metadata["scale"]).reshape(array_size, 3)
                 
                 if ar.file_version >= EUEFormatVersion.PreserveOriginalTransforms:
                     data.vertices *= (1, -1, 1)
                     
             elif header_name == "INDICES":
-                data.indices = np.array(
-                    ar.read_int_vector(array_size),
-                    dtype=np.int32,
-                ).reshape(array_size // 3, 3)
+                data.indices = ar.read_int_array(array_size).reshape(array_size // 3, 3).copy()
             elif header_name == "NORMALS":
                 # W XYZ  # TODO: change to XYZ W 
-                flattened = np.array(ar.read_float_vector(array_size * 4))
-                data.normals = flattened.reshape(-1, 4)[:, 1:]
+                flattened = ar.read_float_array(array_size * 4)
+                data.normals = flattened.reshape(-1, 4)[:, 1:].copy()
 
                 if ar.file_version >= EUEFormatVersion.PreserveOriginalTransforms:
                     data.normals *= (1, -1, 1)
@@ -208,7 +294,7 @@ class UEModelLOD:
                 data.uvs = []
                 for _ in range(array_size):
                     count = ar.read_int()
-                    uvs = np.array(ar.read_float_vector(count * 2)).reshape(count, 2)
+                    uvs = ar.read_float_array(count * 2).reshape(count, 2).copy()
 
                     if ar.file_version >= EUEFormatVersion.PreserveOriginalTransforms:
                         uvs *= (1, -1)
@@ -221,10 +307,7 @@ class UEModelLOD:
                     lambda ar: Material.from_archive(ar),
                 )
             elif header_name == "WEIGHTS":
-                data.weights = ar.read_array(
-                    array_size,
-                    lambda ar: Weight.from_archive(ar),
-                )
+                data.weights = ar.read_numpy_array(array_size, WEIGHT_DTYPE).copy()
             elif header_name == "MORPHTARGETS":
                 data.morphs = ar.read_array(
                     array_size,
@@ -234,9 +317,13 @@ class UEModelLOD:
                 Log.warn(f"Unknown LOD Data: {header_name}")
                 ar.skip(byte_size)
 
-            ar.data.seek(pos + byte_size, 0)
+            ar.seek(pos + byte_size)
         return data
 
+    # bones with at least one non-zero influence on this lod
+    def get_weighted_bone_indices(self) -> npt.NDArray[np.int16]:
+        return np.unique(self.weights["bone_index"][self.weights["weight"] > 0])
+
 
 @dataclass(slots=True)
 class UEModelSkeleton:
@@ -254,7 +341,7 @@ class UEModelSkeleton:
             array_size = ar.read_int()
             byte_size = ar.read_int()
 
-            pos = ar.data.tell()
+            pos = ar.tell()
             match section_name:
                 case "METADATA":
                     data.metadata = UEModelSkeletonMetadata.from_archive(ar)
@@ -276,7 +363,7 @@ class UEModelSkeleton:
                 case _:
                     Log.warn(f"Unknown Skeleton Data: {section_name}")
                     ar.skip(byte_size)
-            ar.data.seek(pos + byte_size, 0)
+            ar.seek(pos + byte_size)
 
         return data
 
@@ -300,8 +387,8 @@ class ConvexCollision:
         name = ar.read_fstring()
 
         vertices_count = ar.read_int()
-        vertices_flattened = ar.read_float_vector(vertices_count * 3)
-        vertices = (np.array(vertices_flattened) * ar.metadata["scale"]).reshape(
+        vertices_flattened = ar.read_float_array(vertices_count * 3)
+        vertices = (vertices_flattened * ar.metadata["scale"]).reshape(
             vertices_count,
             3,
         )
@@ -310,10 +397,7 @@ class ConvexCollision:
             vertices *= (1, -1, 1)
 
         indices_count = ar.read_int()
-        indices = np.array(
-            ar.read_int_vector(indices_count),
-            dtype=np.int32,
-        ).reshape(indices_count // 3, 3)
+        indices = ar.read_int_array(indices_count).reshape(indices_count // 3, 3).copy()
 
         return cls(name=name, vertices=vertices, indices=indices)
 
@@ -327,7 +411,7 @@ class VertexColor:
     def from_archive(cls, ar: FArchiveReader) -> VertexColor:
         name = ar.read_fstring()
         count = ar.read_int()
-        data = (np.array(ar.read_byte_vector(count * 4)).reshape(count, 4) / 255).astype(np.float32)
+        data = ar.read_byte_array(count * 4).reshape(count, 4).astype(np.float32) / 255
 
         return cls(name, data)
 
@@ -369,51 +453,27 @@ class Bone:
         )
 
 
-@dataclass(slots=True)
-class Weight:
-    bone_index: int
-    vertex_index: int
-    weight: float
-
-    @classmethod
-    def from_archive(cls, ar: FArchiveReader) -> Weight:
-        return cls(
-            bone_index=ar.read_short(),
-            vertex_index=ar.read_int(),
-            weight=ar.read_float(),
-        )
-
-
 @dataclass(slots=True)
 class MorphTarget:
     name: str
-    deltas: list[MorphTargetData]
+    positions: npt.NDArray[np.float32]
+    normals: npt.NDArray[np.float32]
+    vertex_indices: npt.NDArray[np.int32]
 
     @classmethod
     def from_archive(cls, ar: FArchiveReader) -> MorphTarget:
-        return cls(
-            name=ar.read_fstring(),
-            deltas=ar.read_serialized_array(
-                lambda ar: MorphTargetData.from_archive(ar),
-            ),
+        name = ar.read_fstring()
+        deltas = ar.read_numpy_array(ar.read_int(), MORPH_DELTA_DTYPE)
+        mirror = np.array(
+            (1, -1, 1) if ar.file_version >= EUEFormatVersion.PreserveOriginalTransforms else (1, 1, 1),
+            dtype=np.float32,
         )
 
-
-@dataclass(slots=True)
-class MorphTargetData:
-    position: list[float]
-    normals: tuple[float, float, float]
-    vertex_index: int
-
-    @classmethod
-    def from_archive(cls, ar: FArchiveReader) -> MorphTargetData:
         return cls(
-            position=ar.read_float_vector(3)
-                      * ar.metadata["scale"]
-                      * ((1, -1, 1) if ar.file_version >= EUEFormatVersion.PreserveOriginalTransforms else (1, 1, 1)),
-            normals=ar.read_float_vector(3)
-                    * ((1, -1, 1) if ar.file_version >= EUEFormatVersion.PreserveOriginalTransforms else (1, 1, 1)),
-            vertex_index=ar.read_int(),
+            name=name,
+            positions=deltas["position"] * ar.metadata["scale"] * mirror,
+            normals=deltas["normal"] * mirror,
+            vertex_indices=deltas["vertex_index"].copy(),
         )
 
 
@@ -544,62 +604,42 @@ class Curve:
 @dataclass(slots=True)
 class Track:
     name: str
-    position_keys: list[VectorKey]
-    rotation_keys: list[QuatKey]
-    scale_keys: list[VectorKey]
+    position_keys: npt.NDArray  # VECTOR_KEY_DTYPE
+    rotation_keys: npt.NDArray  # QUAT_KEY_DTYPE, values are x, y, z, w
+    scale_keys: npt.NDArray  # VECTOR_KEY_DTYPE
 
     @classmethod
     def from_archive(cls, ar: FArchiveReader) -> Track:
-        return cls(
-            name=ar.read_fstring(),
-            position_keys=ar.read_serialized_array(
-                lambda ar: VectorKey.from_archive(ar, ar.metadata["scale"]),
-            ),
-            rotation_keys=ar.read_serialized_array(lambda ar: QuatKey.from_archive(ar)),
-            scale_keys=ar.read_serialized_array(lambda ar: VectorKey.from_archive(ar, allows_mirror=False)),
-        )
+        preserve_transforms = ar.file_version >= EUEFormatVersion.PreserveOriginalTransforms
 
+        name = ar.read_fstring()
 
-@dataclass(slots=True)
-class AnimKey:
-    frame: int
-
-    @classmethod
-    def from_archive(cls, ar: FArchiveReader) -> AnimKey:
-        return cls(frame=ar.read_int())
+        position_keys = ar.read_numpy_array(ar.read_int(), VECTOR_KEY_DTYPE).copy()
+        position_keys["value"] *= ar.metadata["scale"]
+        if preserve_transforms:
+            position_keys["value"] *= (1, -1, 1)
 
+        rotation_keys = ar.read_numpy_array(ar.read_int(), QUAT_KEY_DTYPE).copy()
+        if preserve_transforms:
+            rotation_keys["value"] *= (1, -1, 1, -1)
 
-@dataclass(slots=True)
-class VectorKey(AnimKey):
-    value: list[float]
+        scale_keys = ar.read_numpy_array(ar.read_int(), VECTOR_KEY_DTYPE).copy()
 
-    @classmethod
-    def from_archive(cls, ar: FArchiveReader, multiplier: float = 1.0, allows_mirror: bool = True) -> VectorKey:
         return cls(
-            frame=ar.read_int(),
-            value=ar.read_float_vector(3) 
-                  * multiplier
-                  * ((1, -1, 1) if allows_mirror and ar.file_version >= EUEFormatVersion.PreserveOriginalTransforms else (1, 1, 1)),
+            name=name,
+            position_keys=position_keys,
+            rotation_keys=rotation_keys,
+            scale_keys=scale_keys,
         )
 
-    def get_vector(self) -> Vector:
-        return Vector(self.value)
-
 
 @dataclass(slots=True)
-class QuatKey(AnimKey):
-    value: tuple[float, float, float, float]
+class AnimKey:
+    frame: int
 
     @classmethod
-    def from_archive(cls, ar: FArchiveReader) -> QuatKey:
-        return cls(
-            frame=ar.read_int(),
-            value=ar.read_float_vector(4)
-                  * ((1, -1, 1, -1) if ar.file_version >= EUEFormatVersion.PreserveOriginalTransforms else (1, 1, 1, 1)),
-        )
-
-    def get_quat(self) -> Quaternion:
-        return Quaternion((self.value[3], self.value[0], self.value[1], self.value[2]))
+    def from_archive(cls, ar: FArchiveReader) -> AnimKey:
+        return cls(frame=ar.read_int())
 
 
 @dataclass(slots=True)
@@ -692,13 +732,13 @@ class UEModelPhysics:
             array_size = ar.read_int()
             byte_size = ar.read_int()
 
-            pos = ar.data.tell()
+            pos = ar.tell()
             if header_name == "BODIES":
                 self.bodies = ar.read_array(array_size, lambda ar: BodySetup(ar, scale))
             else:
                 Log.warn(f"Unknown Skeleton Data: {header_name}")
                 ar.skip(byte_size)
-            ar.data.seek(pos + byte_size, 0)
+            ar.seek(pos + byte_size)
 
 class EPhysicsType(IntEnum):
     PhysType_Default = 0
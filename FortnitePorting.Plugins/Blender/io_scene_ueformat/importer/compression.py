@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import threading
+import zlib
+
+try:
+    from zstandard import ZstdDecompressor
+except ImportError:
+    # only needed for zstd compressed files
+    ZstdDecompressor = None
+
+GZIP_WBITS = zlib.MAX_WBITS | 16
+STREAM_CHUNK_SIZE = 1 << 20
+
+_thread_state = threading.local()
+
+
+# zstd decompressors can't be shared between threads that parse at the same time
+def get_zstd_decompressor() -> ZstdDecompressor:
+    if ZstdDecompressor is None:
+        msg = "The zstandard module is required to read ZSTD compressed files"
+        raise ImportError(msg)
+
+    decompressor = getattr(_thread_state, "zstd_decompressor", None)
+    if decompressor is None:
+        decompressor = _thread_state.zstd_decompressor = ZstdDecompressor()
+    return decompressor
+
+
+# both decompressors write into a single buffer sized from the header instead of
+# copying the compressed payload and growing the output as they go
+def decompress_gzip(data: memoryview, uncompressed_size: int) -> bytearray:
+    buffer = bytearray(uncompressed_size)
+    decompressor = zlib.decompressobj(GZIP_WBITS)
+    offset = 0
+
+    for start in range(0, len(data), STREAM_CHUNK_SIZE):
+        pending = data[start:start + STREAM_CHUNK_SIZE]
+        while pending and not decompressor.eof:
+            output = decompressor.decompress(pending, STREAM_CHUNK_SIZE)
+            buffer[offset:offset + len(output)] = output
+            offset += len(output)
+            pending = decompressor.unconsumed_tail
+
+    output = decompressor.flush()
+    buffer[offset:offset + len(output)] = output
+    offset += len(output)
+
+    del buffer[offset:]
+    return buffer
+
+
+def decompress_zstd(decompressor: ZstdDecompressor, data: memoryview, uncompressed_size: int) -> bytearray:
+    buffer = bytearray(uncompressed_size)
+    offset = 0
+
+    with decompressor.stream_reader(data) as reader, memoryview(buffer) as view:
+        while offset < uncompressed_size:
+            read = reader.readinto(view[offset:])
+            if read == 0:
+                break
+            offset += read
+
+    del buffer[offset:]
+    return buffer
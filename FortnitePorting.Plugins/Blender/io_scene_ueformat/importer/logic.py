@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import gzip
+import mmap
 from pathlib import Path
 from typing import cast
 
@@ -14,115 +14,72 @@ from math import *
 from .reorient_utils import reorient_bones
 
 from ..importer.classes import (
-    MAGIC,
     MODEL_IDENTIFIER,
     POSE_IDENTIFIER,
     ANIM_IDENTIFIER,
     Bone,
     ConvexCollision,
-    EUEFormatVersion,
     Material,
     MorphTarget,
     Socket,
     UEAnim,
+    UEAsset,
     UEModel,
     UEModelLOD,
     UEModelSkeleton,
     VertexColor,
-    Weight,
     UEPose
 )
+from ..importer.parser import UEFormatParser
 from ..importer.reader import FArchiveReader
 from ..importer.utils import *
 from ..logging import Log
-from ..options import UEAnimOptions, UEFormatOptions, UEModelOptions, UEPoseOptions
+from ..options import UEAnimOptions, UEModelOptions, UEPoseOptions
 
 
-class UEFormatImport:
-    def __init__(self, options: UEFormatOptions) -> None:
-        self.options = options
-
+# builds blender data from assets read by UEFormatParser
+class UEFormatImport(UEFormatParser):
     def import_file(self, path: str | Path) -> Object | Action:
         path = path if isinstance(path, Path) else Path(path)
 
         Log.time_start(f"Import {path}")
 
-        with path.open("rb") as file:
-            obj = self.import_data(file.read())
+        obj = self.import_asset(self.parse_file(path))
 
         Log.time_end(f"Import {path}")
 
         return obj
 
-    def import_data(self, data: bytes) -> Object | Action:
-        with FArchiveReader(data) as ar:
-            return self.import_data_by_reader(ar)
+    def import_data(self, data: bytes | memoryview | mmap.mmap) -> Object | Action:
+        return self.import_asset(self.parse_data(data))
+
     def import_data_by_reader(self, ar: FArchiveReader) -> Object | Action:
-        magic = ar.read_string(len(MAGIC))
-        if magic != MAGIC:
-            msg = "Invalid magic"
-            raise ValueError(msg)
-
-        identifier = ar.read_fstring()
-        file_version = EUEFormatVersion(int.from_bytes(ar.read_byte(), byteorder="big"))
-        if file_version > EUEFormatVersion.LatestVersion:
-            msg = f"File Version {file_version} is not supported for this version of the importer."
-            Log.error(msg)
-            raise ValueError(msg)
-        object_name = ar.read_fstring()
-        Log.info(f"Importing {object_name}")
-
-        read_archive = ar
-        is_compressed = ar.read_bool()
-        if is_compressed:
-
-            compression_type = ar.read_fstring()
-            uncompressed_size = ar.read_int()
-            _compressed_size = ar.read_int()
-
-            if compression_type == "GZIP":
-                read_archive = FArchiveReader(gzip.decompress(ar.read_to_end()))
-            elif compression_type == "ZSTD":
-                from .. import zstd_decompressor
-                read_archive = FArchiveReader(
-                    zstd_decompressor.decompress(
-                        ar.read_to_end(),
-                        uncompressed_size,
-                    ),
-                )
-            else:
-                msg = f"Unknown Compression Type: {compression_type}"
-                Log.error(msg)
-                raise ValueError(msg)
+        return self.import_asset(self.parse_data_by_reader(ar))
 
-        read_archive.file_version = file_version
-        read_archive.metadata["scale"] = self.options.scale_factor
+    def import_asset(self, asset: UEAsset) -> Object | Action:
+        Log.info(f"Importing {asset.name}")
 
-        if identifier == MODEL_IDENTIFIER:
-            return self.import_uemodel_data(read_archive, object_name)
-        if identifier == ANIM_IDENTIFIER:
-            return self.import_ueanim_data(read_archive, object_name)
-        if identifier == POSE_IDENTIFIER:
-            return self.import_uepose_data(read_archive, object_name)
+        if asset.identifier == MODEL_IDENTIFIER:
+            return self.import_uemodel_data(asset.data, asset.name)
+        if asset.identifier == ANIM_IDENTIFIER:
+            return self.import_ueanim_data(asset.data, asset.name)
+        if asset.identifier == POSE_IDENTIFIER:
+            return self.import_uepose_data(asset.data, asset.name)
 
-        msg = f"Unknown identifier: {identifier}"
+        msg = f"Unknown identifier: {asset.identifier}"
         Log.error(msg)
-        raise ValueError
+        raise ValueError(msg)
 
     # TODO: clean up code quality, esp in the skeleton department
-    def import_uemodel_data(self, ar: FArchiveReader, name: str) -> tuple[bpy.types.Object, UEModel]:
+    def import_uemodel_data(self, data: UEModel, name: str) -> tuple[bpy.types.Object, UEModel]:
         assert isinstance(self.options, UEModelOptions)  # noqa: S101
 
-        data: UEModel
-        if ar.file_version >= EUEFormatVersion.LevelOfDetailFormatRestructure:
-            data = UEModel.from_archive(ar)
-        else:
-            data = UEModel.from_archive_legacy(ar)
-
         # meshes
         return_object = None
+        # models parsed for a target lod only contain that lod
         target_lod = min(self.options.target_lod, len(data.lods) - 1)
         created_lods: list[Object] = []
+        lod_weighted_bones: list[set[str]] = []
         for index, lod in enumerate(data.lods):
             if index != target_lod:
                 continue
@@ -130,7 +87,7 @@ class UEFormatImport:
             lod_name = f"{name}_{lod.name}"
             mesh_data = bpy.data.meshes.new(lod_name)
 
-            mesh_data.from_pydata(lod.vertices, [], lod.indices)  # type: ignore[reportArgumentType]
+            build_mesh(mesh_data, lod.vertices, lod.indices)
 
             mesh_object = bpy.data.objects.new(lod_name, mesh_data)
             return_object = mesh_object
@@ -146,26 +103,47 @@ class UEFormatImport:
                     mesh_data.use_auto_smooth = True
 
             # weights
-            if lod.weights and data.skeleton and data.skeleton.bones:
-                for weight in lod.weights:
-                    bone_name = data.skeleton.bones[weight.bone_index].name
+            weighted_bones: set[str] = set()
+            if len(lod.weights) > 0 and data.skeleton and data.skeleton.bones:
+                # bones that actually deform this lod, used for bone colors instead of scanning the vertex groups
+                weighted_bones = {data.skeleton.bones[bone_index].name for bone_index in lod.get_weighted_bone_indices().tolist()}
+
+                # group influences by bone and then by weight value so each vertex group only needs
+                # one add call per distinct weight instead of one per influence
+                weights = lod.weights[np.lexsort((lod.weights["weight"], lod.weights["bone_index"]))]
+                bone_indices, bone_starts = np.unique(weights["bone_index"], return_index=True)
+                bone_weights = dict(zip(bone_indices.tolist(), np.split(weights, bone_starts[1:])))
+
+                # keep the vertex group order the same as the order bones first appear in
+                _, first_appearances = np.unique(lod.weights["bone_index"], return_index=True)
+                for bone_index in bone_indices[np.argsort(first_appearances)].tolist():
+                    bone_name = data.skeleton.bones[bone_index].name
                     vertex_group = mesh_object.vertex_groups.get(bone_name)
                     if not vertex_group:
                         vertex_group = mesh_object.vertex_groups.new(name=bone_name)
-                    vertex_group.add([weight.vertex_index], weight.weight, "ADD")
+
+                    influences = bone_weights[bone_index]
+                    values, value_starts = np.unique(influences["weight"], return_index=True)
+                    for value, vertex_indices in zip(values.tolist(), np.split(influences["vertex_index"], value_starts[1:])):
+                        vertex_group.add(vertex_indices.tolist(), value, "ADD")
 
             # morph targets
             if self.options.import_morph_targets and lod.morphs:
                 if not mesh_object.data.shape_keys:
                     mesh_object.shape_key_add(name="Basis", from_mix=False)
 
+                basis = np.empty(len(mesh_data.vertices) * 3, dtype=np.float32)
+                mesh_data.vertices.foreach_get("co", basis)
+                basis = basis.reshape(-1, 3)
+
                 for morph in lod.morphs:
                     key = mesh_object.shape_key_add(from_mix=False)
                     key.name = morph.name
                     key.interpolation = "KEY_LINEAR"
 
-                    for delta in morph.deltas:
-                        key.data[delta.vertex_index].co += Vector(delta.position)
+                    key_coords = basis.copy()
+                    np.add.at(key_coords, morph.vertex_indices, morph.positions)
+                    key.data.foreach_set("co", key_coords.ravel())
 
                     # For blender 5.0, keys now get created with a value of 1
                     key.value = 0
@@ -175,9 +153,8 @@ class UEFormatImport:
             )  # Squish nD array into 1D array (required by foreach_set).
             do_remapping = lambda array, indices: array[indices]
 
-            vertices = [vertex for polygon in mesh_data.polygons for vertex in polygon.vertices]
-            # indices = np.array([index for polygon in mesh_data.polygons for index in polygon.loop_indices], dtype=np.int32)
-            # assert np.all(indices[:-1] <= indices[1:]) # check if indices are sorted hmm idk
+            vertices = np.empty(len(mesh_data.loops), dtype=np.int32)
+            mesh_data.loops.foreach_get("vertex_index", vertices)
             for color_info in lod.colors:
                 remapped = do_remapping(color_info.data, vertices)
                 vertex_color = cast(
@@ -197,6 +174,7 @@ class UEFormatImport:
 
             # materials
             if lod.materials:
+                material_indices = np.zeros(len(mesh_data.polygons), dtype=np.int32)
                 for i, material in enumerate(lod.materials):
                     mat = bpy.data.materials.get(material.material_name)
                     if mat is None:
@@ -205,10 +183,12 @@ class UEFormatImport:
 
                     start_face_index = material.first_index // 3
                     end_face_index = start_face_index + material.num_faces
-                    for face_index in range(start_face_index, end_face_index):
-                        mesh_data.polygons[face_index].material_index = i
+                    material_indices[start_face_index:end_face_index] = i
+
+                mesh_data.polygons.foreach_set("material_index", material_indices)
 
             created_lods.append(mesh_object)
+            lod_weighted_bones.append(weighted_bones)
 
         # skeleton
         if data.skeleton and (data.skeleton.bones or (self.options.import_sockets and data.skeleton.sockets)):
@@ -225,40 +205,32 @@ class UEFormatImport:
                 # create bones
                 bpy.ops.object.mode_set(mode="EDIT")
                 edit_bones = armature_data.edit_bones
-                for bone_ in data.skeleton.bones:
-                    bone_pos = Vector(bone_.position)
-                    bone_rot = Quaternion(  # xyzw -> wxyz
-                        (
-                            bone_.rotation[3],
-                            bone_.rotation[0],
-                            bone_.rotation[1],
-                            bone_.rotation[2],
-                        ),
-                    )
 
+                bones = data.skeleton.bones
+                parent_indices = np.array([bone_.parent_index for bone_ in bones], dtype=np.int64)
+                positions = np.array([bone_.position for bone_ in bones], dtype=np.float64).reshape(-1, 3)
+                rotations = np.array([bone_.rotation for bone_ in bones], dtype=np.float64).reshape(-1, 4)[:, [3, 0, 1, 2]]  # xyzw -> wxyz
+                world_matrices = make_world_matrices(make_transform_matrices(positions, rotations), parent_indices)
+
+                created_bones: list[EditBone] = []
+                bone_length = self.options.bone_length * self.options.scale_factor
+                for bone_, position, rotation, world_matrix in zip(bones, positions.tolist(), rotations.tolist(), world_matrices.tolist()):
                     edit_bone = edit_bones.new(bone_.name)
-                    edit_bone["orig_loc"] = bone_pos
+                    edit_bone["orig_loc"] = position
                     # TODO: unravel all these conjugations wtf, it works so imma leave it but jfc it's awful  # noqa: TD003, TD002, FIX002
-                    edit_bone["orig_quat"] = bone_rot.conjugated()
-                    edit_bone.length = self.options.bone_length * self.options.scale_factor
-
-                    bone_matrix = Matrix.Translation(bone_pos) @ bone_rot.to_matrix().to_4x4()
+                    edit_bone["orig_quat"] = (rotation[0], -rotation[1], -rotation[2], -rotation[3])
+                    edit_bone.length = bone_length
+                    edit_bone.matrix = Matrix(world_matrix)  # type: ignore[reportAttributeAccessIssue]
 
-                    if bone_.parent_index >= 0:
-                        parent_bone = cast(
-                            EditBone | None,
-                            edit_bones.get(
-                                data.skeleton.bones[bone_.parent_index].name,
-                            ),
-                        )
-                        assert parent_bone  # noqa: S101
-                        edit_bone.parent = parent_bone
-                        bone_matrix = cast(Matrix, parent_bone.matrix) @ bone_matrix
+                    if not self.options.reorient_bones:
+                        edit_bone["post_quat"] = rotation
 
-                    edit_bone.matrix = bone_matrix  # type: ignore[reportAttributeAccessIssue]
+                    created_bones.append(edit_bone)
 
-                    if not self.options.reorient_bones:
-                        edit_bone["post_quat"] = bone_rot
+                # parents are set by index once every bone exists, so names that blender had to change still resolve
+                for edit_bone, parent_index in zip(created_bones, parent_indices.tolist()):
+                    if parent_index >= 0:
+                        edit_bone.parent = created_bones[parent_index]
 
                 bpy.ops.object.mode_set(mode="OBJECT")
 
@@ -367,7 +339,7 @@ class UEFormatImport:
                     if virtual_bone is not None:
                         virtual_bone.color.palette = "THEME11"
 
-            for lod in created_lods:
+            for lod, weighted_bones in zip(created_lods, lod_weighted_bones):
                 armature_object = bpy.data.objects.new(
                     lod.name + "_Skeleton",
                     armature_data,
@@ -399,7 +371,7 @@ class UEFormatImport:
 
                 # bone colors
                 for bone in armature_object.pose.bones:
-                    if not (vertex_group := lod.vertex_groups.get(bone.name)) or not has_vertex_weights(lod, vertex_group):
+                    if bone.name not in weighted_bones:
                         bone.color.palette = "THEME14"
                         continue
 
@@ -426,7 +398,7 @@ class UEFormatImport:
                 collision_name = index if collision.name == "None" else collision.name
                 collision_object_name = f"UCX_{name}_{collision_name}"
                 collision_mesh_data = bpy.data.meshes.new(collision_object_name)
-                collision_mesh_data.from_pydata(collision.vertices, [], collision.indices)  # type: ignore[reportArgumentType]
+                build_mesh(collision_mesh_data, collision.vertices, collision.indices)
 
                 collision_mesh_object = bpy.data.objects.new(collision_object_name, collision_mesh_data)
                 collision_mesh_object.display_type = "WIRE"
@@ -435,11 +407,9 @@ class UEFormatImport:
 
         return return_object, data
 
-    def import_ueanim_data(self, ar: FArchiveReader, name: str) -> tuple[bpy.types.Action, UEAnim]:
+    def import_ueanim_data(self, data: UEAnim, name: str) -> tuple[bpy.types.Action, UEAnim]:
         assert isinstance(self.options, UEAnimOptions)  # noqa: S101
 
-        data = UEAnim.from_archive(ar)
-
         action = bpy.data.actions.new(name=name)
 
         armature = self.options.override_skeleton or get_active_armature()
@@ -485,49 +455,33 @@ class UEFormatImport:
                     
                 return curves
 
-            def add_key(
-                curves: list[FCurve],
-                vector: Vector | list[float] | Quaternion,
-                key_index: int,
-                frame: int,
-            ) -> None:
-                for i in range(len(vector)):
-                    curves[i].keyframe_points[key_index].co = frame, vector[i]
-                    curves[i].keyframe_points[key_index].interpolation = "LINEAR"
-                    curves[i].keyframe_points[key_index].interpolation = "LINEAR"
-
-            orig_loc = Vector(orig_loc) if (orig_loc := bone.bone.get("orig_loc")) else Vector()
-            orig_quat = Quaternion(orig_quat) if (orig_quat := bone.bone.get("orig_quat")) else Quaternion()
-            post_quat = Quaternion(post_quat) if (post_quat := bone.bone.get("post_quat")) else Quaternion()
+            def add_keys(curves: list[FCurve], keys: np.ndarray, values: np.ndarray) -> None:
+                for i, curve in enumerate(curves):
+                    set_keyframes(curve, keys["frame"], values[:, i])
+
+            orig_loc = np.array(orig_loc) if (orig_loc := bone.bone.get("orig_loc")) else np.zeros(3)
+            orig_quat = np.array(orig_quat) if (orig_quat := bone.bone.get("orig_quat")) else np.array((1.0, 0.0, 0.0, 0.0))
+            post_quat = np.array(post_quat) if (post_quat := bone.bone.get("post_quat")) else np.array((1.0, 0.0, 0.0, 0.0))
 
             if not self.options.rotation_only:
                 loc_curves = create_fcurves("location", 3, len(track.position_keys), bone)
                 scale_curves = create_fcurves("scale", 3, len(track.scale_keys), bone)
-                for index, key in enumerate(track.position_keys):
-                    pos = key.get_vector()
-                    pos -= orig_loc
-                    pos.rotate(post_quat.conjugated())
-
-                    add_key(loc_curves, pos, index, key.frame)
 
-                for index, key in enumerate(track.scale_keys):
-                    add_key(scale_curves, key.value, index, key.frame)
+                positions = quat_rotate_vectors(quat_conjugate(post_quat), track.position_keys["value"] - orig_loc)
+                add_keys(loc_curves, track.position_keys, positions)
+                add_keys(scale_curves, track.scale_keys, track.scale_keys["value"])
 
             rot_curves = create_fcurves("rotation_quaternion", 4, len(track.rotation_keys), bone)
-            for index, key in enumerate(track.rotation_keys):
-                p_quat = key.get_quat().conjugated()
-
-                q = post_quat.copy()
-                q.rotate(orig_quat)
-
-                quat = q
 
-                q = post_quat.copy()
-
-                q.rotate(p_quat)
-                quat.rotate(q.conjugated())
-
-                add_key(rot_curves, quat, index, key.frame)
+            # same as rotating post_quat by orig_quat, then by the conjugate of post_quat rotated by each
+            # conjugated key, done for every key at once (mathutils keeps w positive and the length of post_quat)
+            key_quats = quat_conjugate(track.rotation_keys["value"][:, [3, 0, 1, 2]].astype(np.float64))
+            base_quat = quat_normalize(quat_multiply(orig_quat, post_quat))
+            key_quats = quat_normalize(quat_multiply(key_quats, post_quat))
+            quats = quat_normalize(quat_multiply(quat_conjugate(key_quats), base_quat))
+            quats[quats[:, 0] < 0] *= -1
+            quats *= np.linalg.norm(post_quat)
+            add_keys(rot_curves, track.rotation_keys, quats)
 
             bone.matrix_basis.identity()  # type: ignore[reportAttributeAccessIssue]
 
@@ -558,10 +512,8 @@ class UEFormatImport:
 
         return action, data
 
-    def import_uepose_data(self, ar: FArchiveReader, name: str):
+    def import_uepose_data(self, data: UEPose, name: str):
         assert isinstance(self.options, UEPoseOptions)  # noqa: S101
-        
-        data = UEPose.from_archive(ar)
 
         selected_armature = self.options.override_skeleton or get_active_armature()
         assert isinstance(selected_armature, bpy.types.Object)  # noqa: S101
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import mmap
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ..importer.cache import get_asset_cache
+from ..importer.classes import (
+    ANIM_IDENTIFIER,
+    MODEL_IDENTIFIER,
+    POSE_IDENTIFIER,
+    EUEFormatVersion,
+    UEAnim,
+    UEAsset,
+    UEFormatHeader,
+    UEModel,
+    UEPose,
+)
+from ..importer.compression import decompress_gzip, decompress_zstd, get_zstd_decompressor
+from ..importer.reader import FArchiveReader
+from ..logging import Log
+from ..options import UEModelOptions
+
+if TYPE_CHECKING:
+    from ..options import UEFormatOptions
+
+
+# reads files into UEAsset without touching bpy, so it also works in worker threads and processes outside of blender
+class UEFormatParser:
+    def __init__(self, options: UEFormatOptions) -> None:
+        self.options = options
+
+    def parse_file(self, path: str | Path) -> UEAsset:
+        path = path if isinstance(path, Path) else Path(path)
+
+        if not self.options.cache_directory:
+            return self.parse_file_uncached(path)
+
+        cache = get_asset_cache(self.options.cache_directory, self.options.cache_size_limit)
+        entry = cache.entry_path(path, self.options)
+        if (asset := cache.get(entry)) is not None:
+            return asset
+
+        asset = self.parse_file_uncached(path)
+        cache.put(entry, asset)
+        return asset
+
+    def parse_file_uncached(self, path: Path) -> UEAsset:
+        with path.open("rb") as file:
+            if self.options.memory_map and path.stat().st_size > 0:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    return self.parse_data(mapped)
+                finally:
+                    # views that are still referenced keep the mapping alive until they are collected
+                    with suppress(BufferError):
+                        mapped.close()
+
+            return self.parse_data(file.read())
+
+    def parse_data(self, data: bytes | memoryview | mmap.mmap) -> UEAsset:
+        with FArchiveReader(data) as ar:
+            return self.parse_data_by_reader(ar)
+
+    def parse_data_by_reader(self, ar: FArchiveReader) -> UEAsset:
+        header = UEFormatHeader.from_archive(ar)
+        identifier = header.identifier
+        file_version = header.file_version
+        object_name = header.name
+
+        read_archive = ar
+        if header.is_compressed:
+            compression_type = header.compression_type
+            uncompressed_size = header.uncompressed_size
+
+            if compression_type == "GZIP":
+                read_archive = FArchiveReader(decompress_gzip(ar.read_view_to_end(), uncompressed_size))
+            elif compression_type == "ZSTD":
+                read_archive = FArchiveReader(
+                    decompress_zstd(
+                        get_zstd_decompressor(),
+                        ar.read_view_to_end(),
+                        uncompressed_size,
+                    ),
+                )
+            else:
+                msg = f"Unknown Compression Type: {compression_type}"
+                Log.error(msg)
+                raise ValueError(msg)
+
+        read_archive.file_version = file_version
+        read_archive.metadata["scale"] = self.options.scale_factor
+
+        data: UEModel | UEAnim | UEPose
+        if identifier == MODEL_IDENTIFIER:
+            if file_version >= EUEFormatVersion.LevelOfDetailFormatRestructure:
+                target_lod = self.options.target_lod if isinstance(self.options, UEModelOptions) else None
+                data = UEModel.from_archive(read_archive, target_lod)
+            else:
+                data = UEModel.from_archive_legacy(read_archive)
+        elif identifier == ANIM_IDENTIFIER:
+            data = UEAnim.from_archive(read_archive)
+        elif identifier == POSE_IDENTIFIER:
+            data = UEPose.from_archive(read_archive)
+        else:
+            msg = f"Unknown identifier: {identifier}"
+            Log.error(msg)
+            raise ValueError(msg)
+
+        return UEAsset(identifier=identifier, name=object_name, file_version=file_version, data=data)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import mmap
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..importer.classes import (
+    MODEL_IDENTIFIER,
+    EUEFormatVersion,
+    UEFormatHeader,
+    UEFormatSection,
+    UEModelLODEntry,
+)
+from ..importer.reader import FArchiveReader
+
+
+@dataclass(slots=True)
+class UEFormatProbe:
+    header: UEFormatHeader
+    file_size: int
+    # only known for uncompressed files, compressed ones would have to be decompressed first
+    sections: list[UEFormatSection] | None = None
+    lod_table: list[UEModelLODEntry] | None = None
+
+
+# reads the header and section table of a file without parsing any of the section data.
+# the file is memory mapped so only the pages holding headers are read from disk
+def probe(path: str | Path) -> UEFormatProbe:
+    path = path if isinstance(path, Path) else Path(path)
+
+    with path.open("rb") as file:
+        file_size = path.stat().st_size
+        if file_size == 0:
+            msg = "Invalid magic"
+            raise ValueError(msg)
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, FArchiveReader(mapped) as ar:
+            return probe_by_reader(ar, file_size)
+
+
+def probe_by_reader(ar: FArchiveReader, file_size: int) -> UEFormatProbe:
+    data = UEFormatProbe(header=UEFormatHeader.from_archive(ar), file_size=file_size)
+    if data.header.is_compressed:
+        return data
+
+    data.sections = []
+    while not ar.eof():
+        data.sections.append(UEFormatSection.from_archive(ar))
+
+    is_model = data.header.identifier == MODEL_IDENTIFIER
+    if is_model and data.header.file_version >= EUEFormatVersion.LevelOfDetailFormatRestructure:
+        for section in data.sections:
+            if section.name == "LODS":
+                ar.seek(section.offset)
+                data.lod_table = ar.read_array(section.array_size, lambda ar: UEModelLODEntry.from_archive(ar))
+
+    return data
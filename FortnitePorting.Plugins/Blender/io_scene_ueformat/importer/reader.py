@@ -1,12 +1,10 @@
 from __future__ import annotations
 
-import io
 import struct
 import numpy as np
 import numpy.typing as npt
-from typing import TYPE_CHECKING, BinaryIO, Literal, TypeVar, overload
+from typing import TYPE_CHECKING, Literal, TypeVar, overload
 
-from ..importer.utils import bytes_to_str
 from ..importer.classes import EUEFormatVersion
 
 if TYPE_CHECKING:
@@ -15,17 +13,27 @@ if TYPE_CHECKING:
 
 R = TypeVar("R")
 
+BOOL = struct.Struct("?")
+INT = struct.Struct("i")
+SHORT = struct.Struct("h")
+BYTE = struct.Struct("c")
+FLOAT = struct.Struct("f")
+
+
+def bytes_to_str(in_bytes: bytes) -> str:
+    return in_bytes.rstrip(b"\x00").decode()
+
 
 class FArchiveReader:
-    def __init__(self, data: bytes) -> None:
-        self.data: BinaryIO = io.BytesIO(data)
-        self.size = len(data)
-        self.data.seek(0)
+    def __init__(self, data: bytes | bytearray | memoryview) -> None:
+        self.data: memoryview = memoryview(data).cast("B")
+        self.size = len(self.data)
+        self.position = 0
         self.file_version = EUEFormatVersion.BeforeCustomVersionWasAdded
         self.metadata = {}
 
     def __enter__(self) -> FArchiveReader:
-        self.data.seek(0)
+        self.position = 0
         return self
 
     def __exit__(
@@ -34,46 +42,62 @@ class FArchiveReader:
         exc_value: BaseException | None,
         traceback: TracebackType | None,
     ) -> None:
-        self.data.close()
+        self.data.release()
 
     def eof(self) -> bool:
-        return self.data.tell() >= self.size
+        return self.position >= self.size
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, position: int) -> None:
+        self.position = position
+
+    def skip(self, size: int) -> None:
+        self.position += size
+
+    def read_view(self, size: int) -> memoryview:
+        view = self.data[self.position:self.position + size]
+        self.position += len(view)
+        return view
+
+    def read_view_to_end(self) -> memoryview:
+        return self.read_view(self.size - self.position)
 
     def read(self, size: int) -> bytes:
-        return self.data.read(size)
+        return bytes(self.read_view(size))
 
     def read_to_end(self) -> bytes:
-        return self.data.read(self.size - self.data.tell())
+        return bytes(self.read_view_to_end())
 
     def read_bool(self) -> bool:
-        return struct.unpack("?", self.data.read(1))[0]
+        return self._unpack(BOOL)
 
     def read_string(self, size: int) -> str:
-        string = self.data.read(size)
-        return bytes_to_str(string)
+        return bytes_to_str(self.read(size))
 
     def read_fstring(self) -> str:
-        (size,) = struct.unpack("i", self.data.read(4))
-        string = self.data.read(size)
-        ret = bytes_to_str(string)
-        return ret
+        size = self.read_int()
+        return bytes_to_str(self.read(size))
 
     def read_int(self) -> int:
-        return struct.unpack("i", self.data.read(4))[0]
+        return self._unpack(INT)
 
     def read_int_vector(self, size: int) -> tuple[int, ...]:
         if size <= 0:
             return ()
-        return struct.unpack(str(size) + "I", self.data.read(size * 4))
+        values = struct.unpack_from(str(size) + "I", self.data, self.position)
+        self.position += size * 4
+        return values
 
     def read_short(self) -> int:
-        return struct.unpack("h", self.data.read(2))[0]
+        return self._unpack(SHORT)
 
     def read_byte(self) -> bytes:
-        return struct.unpack("c", self.data.read(1))[0]
+        return self._unpack(BYTE)
 
     def read_float(self) -> float:
-        return struct.unpack("f", self.data.read(4))[0]
+        return self._unpack(FLOAT)
 
     @overload
     def read_float_vector(self, size: Literal[1]) -> tuple[float]: ...
@@ -87,13 +111,26 @@ class FArchiveReader:
     def read_float_vector(self, size: int) -> tuple[float, ...]: ...
 
     def read_float_vector(self, size: int) -> npt.NDArray[float]:
-        return np.array(struct.unpack(str(size) + "f", self.data.read(size * 4)))
+        return self.read_float_array(size).astype(np.float64)
 
     def read_byte_vector(self, size: int) -> tuple[int, ...]:
-        return struct.unpack(str(size) + "B", self.data.read(size))
+        values = struct.unpack_from(str(size) + "B", self.data, self.position)
+        self.position += size
+        return values
 
-    def skip(self, size: int) -> None:
-        self.data.seek(size, 1)
+    # bulk readers return views into the archive buffer, copy them if they need to outlive the reader
+    def read_numpy_array(self, count: int, dtype: npt.DTypeLike) -> npt.NDArray:
+        dtype = np.dtype(dtype)
+        return np.frombuffer(self.read_view(count * dtype.itemsize), dtype=dtype, count=count)
+
+    def read_float_array(self, count: int) -> npt.NDArray[np.float32]:
+        return self.read_numpy_array(count, np.float32)
+
+    def read_int_array(self, count: int) -> npt.NDArray[np.int32]:
+        return self.read_numpy_array(count, np.int32)
+
+    def read_byte_array(self, count: int) -> npt.NDArray[np.uint8]:
+        return self.read_numpy_array(count, np.uint8)
 
     def read_serialized_array(self, predicate: Callable[[FArchiveReader], R]) -> list[R]:
         count = self.read_int()
@@ -107,8 +144,13 @@ class FArchiveReader:
         return [predicate(self) for _ in range(count)]
 
     def chunk(self, size: int) -> FArchiveReader:
-        new_reader = FArchiveReader(self.read(size))
+        new_reader = FArchiveReader(self.read_view(size))
         new_reader.file_version = self.file_version
         new_reader.metadata = self.metadata
-        
+
         return new_reader
+
+    def _unpack(self, fmt: struct.Struct):
+        (value,) = fmt.unpack_from(self.data, self.position)
+        self.position += fmt.size
+        return value
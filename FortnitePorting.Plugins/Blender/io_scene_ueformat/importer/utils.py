@@ -2,14 +2,13 @@ from collections.abc import Collection
 from typing import cast
 
 import bpy
-from bpy.types import PoseBone, bpy_prop_collection
+import numpy as np
+import numpy.typing as npt
+from bpy.types import FCurve, Mesh, PoseBone, bpy_prop_collection
 from mathutils import Vector, Quaternion
 from math import *
 
 
-def bytes_to_str(in_bytes: bytes) -> str:
-    return in_bytes.rstrip(b"\x00").decode()
-
 # linq 
 def first(target, expr, default=None):
     if not target:
@@ -32,6 +31,23 @@ def best(target, expr, goal, default=None):
 
     return default
 
+# same result as from_pydata for triangle lists, but written straight from the parsed arrays
+def build_mesh(mesh_data: Mesh, vertices: npt.NDArray, indices: npt.NDArray) -> None:
+    face_count = len(indices)
+
+    mesh_data.vertices.add(len(vertices))
+    mesh_data.vertices.foreach_set("co", np.ascontiguousarray(vertices, dtype=np.float32).ravel())
+
+    mesh_data.loops.add(face_count * 3)
+    mesh_data.loops.foreach_set("vertex_index", np.ascontiguousarray(indices, dtype=np.int32).ravel())
+
+    mesh_data.polygons.add(face_count)
+    mesh_data.polygons.foreach_set("loop_start", np.arange(0, face_count * 3, 3, dtype=np.int32))
+    if bpy.app.version < (4, 0, 0):
+        mesh_data.polygons.foreach_set("loop_total", np.full(face_count, 3, dtype=np.int32))
+
+    mesh_data.update(calc_edges=True)
+
 def make_axis_vector(vec_in: Vector) -> Vector:
     vec_out = Vector()
     x, y, z = vec_in
@@ -175,6 +191,84 @@ def make_quat(rot):
 def make_vector(vec):
     return Vector((vec[0], vec[1], vec[2]))
 
-def has_vertex_weights(obj, vertex_group):
-    mesh = obj.data
-    return any(vertex_group.index in [g.group for g in v.groups] for v in mesh.vertices)
\ No newline at end of file
+# batched quaternion math on (..., 4) arrays in w, x, y, z order, matching mathutils
+def quat_multiply(a: npt.NDArray, b: npt.NDArray) -> npt.NDArray:
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+    return np.stack((
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ), axis=-1)
+
+def quat_conjugate(quats: npt.NDArray) -> npt.NDArray:
+    return quats * (1, -1, -1, -1)
+
+def quat_normalize(quats: npt.NDArray) -> npt.NDArray:
+    return quats / np.linalg.norm(quats, axis=-1, keepdims=True)
+
+def quat_rotate_vectors(quat: npt.NDArray, vectors: npt.NDArray) -> npt.NDArray:
+    quat = quat_normalize(quat)
+    axis = quat[..., 1:]
+    cross = 2 * np.cross(axis, vectors)
+    return vectors + quat[..., :1] * cross + np.cross(axis, cross)
+
+# same as Matrix.Translation(position) @ quat.to_matrix().to_4x4() for every pair
+def make_transform_matrices(positions: npt.NDArray, quats: npt.NDArray) -> npt.NDArray:
+    w, x, y, z = np.moveaxis(quats, -1, 0)
+    matrices = np.zeros((*quats.shape[:-1], 4, 4))
+    matrices[..., 0, 0] = 1 - 2 * (y * y + z * z)
+    matrices[..., 0, 1] = 2 * (x * y - w * z)
+    matrices[..., 0, 2] = 2 * (x * z + w * y)
+    matrices[..., 1, 0] = 2 * (x * y + w * z)
+    matrices[..., 1, 1] = 1 - 2 * (x * x + z * z)
+    matrices[..., 1, 2] = 2 * (y * z - w * x)
+    matrices[..., 2, 0] = 2 * (x * z - w * y)
+    matrices[..., 2, 1] = 2 * (y * z + w * x)
+    matrices[..., 2, 2] = 1 - 2 * (x * x + y * y)
+    matrices[..., :3, 3] = positions
+    matrices[..., 3, 3] = 1
+    return matrices
+
+# multiplies each local matrix by its parent's world matrix, one batch per hierarchy depth
+def make_world_matrices(local_matrices: npt.NDArray, parent_indices: npt.NDArray) -> npt.NDArray:
+    count = len(parent_indices)
+    has_parent = parent_indices >= 0
+
+    depths = np.zeros(count, dtype=np.int32)
+    ancestors = np.where(has_parent, parent_indices, -1)
+    for _ in range(count):
+        has_ancestor = ancestors >= 0
+        if not has_ancestor.any():
+            break
+        depths += has_ancestor
+        ancestors = np.where(has_ancestor, parent_indices[ancestors], -1)
+
+    if (ancestors >= 0).any():
+        msg = "Bone hierarchy contains a cycle"
+        raise ValueError(msg)
+
+    world_matrices = local_matrices.copy()
+    for depth in range(1, depths.max(initial=0) + 1):
+        indices = np.flatnonzero(depths == depth)
+        world_matrices[indices] = world_matrices[parent_indices[indices]] @ local_matrices[indices]
+    return world_matrices
+
+KEYFRAME_INTERPOLATION_LINEAR = 1
+
+def set_keyframes(curve: FCurve, frames: npt.NDArray, values: npt.NDArray) -> None:
+    coords = np.empty((len(frames), 2), dtype=np.float32)
+    coords[:, 0] = frames
+    coords[:, 1] = values
+
+    keyframe_points = curve.keyframe_points
+    keyframe_points.foreach_set("co", coords.ravel())
+    try:
+        keyframe_points.foreach_set("interpolation", np.full(len(frames), KEYFRAME_INTERPOLATION_LINEAR, dtype=np.int32))
+    except (TypeError, RuntimeError):
+        # enum properties don't support bulk access on every blender version
+        for keyframe_point in keyframe_points:
+            keyframe_point.interpolation = "LINEAR"
+
+    curve.update()
@@ -14,6 +14,9 @@ if TYPE_CHECKING:
 class UEFormatOptions:
     link: bool = True
     scale_factor: float = 0.01
+    memory_map: bool = True
+    cache_directory: str | None = None
+    cache_size_limit: int = 2 << 30
 
     @classmethod
     def from_settings(cls, settings: UFSettings) -> UEFormatOptions:
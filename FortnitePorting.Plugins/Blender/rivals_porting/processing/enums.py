@@ -16,6 +16,11 @@ class EPolygonType(IntEnum):
     QUADS = 1
 
 
+class EInstanceType(IntEnum):
+    OBJECTS = 0
+    POINT_CLOUD = 1
+
+
 class EExportType(IntEnum):
     NONE = 0
 
@@ -1,11 +1,13 @@
 import json
 import math
 import os.path
+import time
 import traceback
 import pyperclip
 
 import bpy
 import traceback
+import numpy as np
 from math import radians
 
 from .mappings import *
@@ -13,17 +15,25 @@ from .material import *
 from .enums import *
 from .utils import *
 from .tasty import *
+from .prefetch import AssetPrefetcher, read_files
+from .registry import MeshRegistry
 from ..utils import *
 from ..logger import Log
 from ...io_scene_ueformat.importer.logic import UEFormatImport
+from ...io_scene_ueformat.importer.parser import UEFormatParser
 from ...io_scene_ueformat.importer.classes import UEAnim
 from ...io_scene_ueformat.options import UEModelOptions, UEAnimOptions, UEPoseOptions
 
+# older versions tagged template materials with their key, it's stripped from existing materials
+LEGACY_TEMPLATE_KEY_PROPERTY = "MaterialTemplateKey"
+
+
 class ImportContext:
 
     def __init__(self, meta_data):
         self.options = meta_data.get("Settings")
         self.assets_root = meta_data.get("AssetsRoot")
+        self.cache_directory = os.path.join(self.assets_root, ".UEFormatCache") if self.options.get("CacheParsedAssets") else None
 
     def run(self, data):
         self.name = data.get("Name")
@@ -36,6 +46,12 @@ class ImportContext:
         self.full_vertex_crunch_materials = []
         self.partial_vertex_crunch_materials = {}
         self.add_toon_outline = False
+        self.prefetcher = None
+        self.pending_meshes = {}
+        self.material_index = None
+        self.material_templates = {}
+        self.material_template_keys = {}
+        self.image_paths = {}
 
         if bpy.context.mode != "OBJECT":
             bpy.ops.object.mode_set(mode='OBJECT')
@@ -88,8 +104,17 @@ class ImportContext:
             target_meshes = data.get("Meshes")
 
         self.meshes = target_meshes
-        for mesh in target_meshes:
-            self.import_model(mesh, can_spawn_at_3d_cursor=True)
+        self.load_images(self.gather_texture_paths(target_meshes))
+
+        self.prefetcher = AssetPrefetcher(UEFormatParser(self.get_model_options()).parse_file, self.gather_mesh_paths(target_meshes))
+        try:
+            for mesh in target_meshes:
+                self.import_model(mesh, can_spawn_at_3d_cursor=True)
+        finally:
+            self.prefetcher.shutdown()
+            self.prefetcher = None
+
+        self.post_process_meshes()
 
         self.import_light_data(data.get("Lights"))
             
@@ -156,6 +181,93 @@ class ImportContext:
                 return meta.get(found_key)
         return None
 
+    # walks meshes in the same order import_model does so the prefetcher parses them in the order they are needed
+    def gather_mesh_paths(self, meshes):
+        for mesh in meshes:
+            if not mesh.get("IsEmpty"):
+                path = mesh.get("Path")
+                registry_key = self.get_registry_key(path)
+                if registry_key is None or MeshRegistry.get(registry_key) is None:
+                    yield self.get_mesh_path(path)
+
+            yield from self.gather_mesh_paths(mesh.get("Children"))
+
+    # textures of every material the export will build. materials that hash reuse will pick up from the file
+    # are skipped, the same way import_material skips them
+    def gather_texture_paths(self, meshes):
+        built_hashes = set()
+
+        def material_texture_paths(material_data, meta):
+            if material_data is None:
+                return
+
+            _, material_hash = self.get_material_hash(material_data, meta)
+            material_hash = hash_code(material_hash)
+            if material_hash in built_hashes or self.get_material_by_hash(material_hash):
+                return
+            built_hashes.add(material_hash)
+
+            for texture in material_data.get("Textures") or []:
+                yield texture.get("Value")
+
+            for data in meta.get("TextureData") or []:
+                for texture in [data.get("Diffuse"), data.get("Normal"), data.get("Specular")]:
+                    if texture is not None:
+                        yield texture.get("Value")
+
+            for parameters in self.get_override_parameters(material_data.get("Name")):
+                for texture in parameters.get("Textures") or []:
+                    yield texture.get("Value")
+
+        def mesh_texture_paths(mesh):
+            meta = {"TextureData": mesh.get("TextureData")}
+            for material_data in mesh.get("Materials") or []:
+                yield from material_texture_paths(material_data, meta)
+
+            for material_data in mesh.get("OverrideMaterials") or []:
+                yield from material_texture_paths(material_data, meta)
+
+            for variant_override_material in self.override_materials or []:
+                yield from material_texture_paths(variant_override_material.get("Material"), meta)
+
+            for child in mesh.get("Children") or []:
+                yield from mesh_texture_paths(child)
+
+        for mesh in meshes:
+            yield from mesh_texture_paths(mesh)
+
+    # reads the textures from disk in parallel and loads them up front so building materials only binds images
+    def load_images(self, paths):
+        start_time = time.perf_counter()
+
+        # loaded images are named after their file, so they're matched by path instead of by texture name
+        loaded_paths = {os.path.normcase(os.path.abspath(bpy.path.abspath(image.filepath))) for image in bpy.data.images if image.filepath}
+
+        image_paths = {}
+        for path in dict.fromkeys(paths):
+            if not isinstance(path, str) or len(path.split(".")) != 2:
+                continue
+
+            image_path, _ = self.format_image_path(path)
+            if os.path.normcase(os.path.abspath(image_path)) not in loaded_paths:
+                image_paths[image_path] = None
+
+        exists = read_files(image_paths.keys())
+        self.image_paths.update(exists)
+
+        loaded_count = 0
+        for image_path in image_paths:
+            if not exists.get(image_path):
+                continue
+
+            try:
+                bpy.data.images.load(image_path, check_existing=True)
+                loaded_count += 1
+            except RuntimeError:
+                pass
+
+        Log.info(f"Loaded {loaded_count} of {len(image_paths)} textures in {time.perf_counter() - start_time:.2f}s")
+
     def import_model(self, mesh, parent=None, can_reorient=True, can_spawn_at_3d_cursor=False):
         path = mesh.get("Path")
         name = mesh.get("Name")
@@ -180,14 +292,20 @@ class ImportContext:
         if self.type in [EExportType.PREFAB, EExportType.WORLD] and mesh in self.meshes:
             Log.info(f"Importing Actor: {name} {self.meshes.index(mesh)} / {len(self.meshes)}")
 
-        mesh_name = path.split(".")[1]
-        if self.type in [EExportType.PREFAB, EExportType.WORLD] and (existing_mesh_data := bpy.data.meshes.get(mesh_name + "_LOD0")):
+        registry_key = self.get_registry_key(path)
+        if registry_key is not None and (existing_mesh_data := MeshRegistry.get(registry_key)):
             imported_object = bpy.data.objects.new(name, existing_mesh_data)
             self.collection.objects.link(imported_object)
-            
+
+            # materials are assigned per object so overrides on this copy don't leak into the shared mesh
+            for slot in imported_object.material_slots:
+                material = slot.material
+                slot.link = "OBJECT"
+                slot.material = material
+
             imported_mesh = get_armature_mesh(imported_object)
         else:
-            imported_object = self.import_mesh(path, can_reorient=can_reorient)
+            imported_object, model = self.import_mesh(path, can_reorient=can_reorient)
             if imported_object is None:
                 Log.warn(f"Import failed for object at path: {path}")
                 return imported_object
@@ -195,15 +313,17 @@ class ImportContext:
 
             imported_mesh = get_armature_mesh(imported_object)
 
-            if EPolygonType(self.options.get("PolygonType")) == EPolygonType.QUADS and imported_mesh is not None:
-                bpy.context.view_layer.objects.active = imported_mesh
-                bpy.ops.object.mode_set(mode='EDIT')
-                bpy.ops.mesh.tris_convert_to_quads(uvs=True)
-                bpy.ops.object.mode_set(mode='OBJECT')
-                bpy.context.view_layer.objects.active = imported_object
+            # skeletal meshes need their whole hierarchy and collision objects aren't part of the mesh, so those are
+            # always imported
+            has_collision = self.options.get("ImportCollision") and len(model.collisions) > 0
+            if registry_key is not None and imported_object.type == "MESH" and len(imported_object.children) == 0 and not has_collision:
+                MeshRegistry.add(registry_key, imported_object.data)
 
         if (override_vertex_colors := mesh.get("OverrideVertexColors")) and len(override_vertex_colors) > 0:
-            imported_mesh.data = imported_mesh.data.copy()
+            source_mesh_data = imported_mesh.data
+            imported_mesh.data = source_mesh_data.copy()
+            if source_mesh_data.as_pointer() in self.pending_meshes:
+                self.add_pending_mesh(imported_mesh.data)
 
             vertex_color = imported_mesh.data.color_attributes.new(
                 domain="CORNER",
@@ -211,17 +331,18 @@ class ImportContext:
                 name="INSTCOL0",
             )
 
-            color_data = []
-            for col in override_vertex_colors:
-                color_data.append((col["R"], col["G"], col["B"], col["A"]))
+            color_data = np.array([(col["R"], col["G"], col["B"], col["A"]) for col in override_vertex_colors], dtype=np.float32) / 255
 
-            for polygon in imported_mesh.data.polygons:
-                for vertex_index, loop_index in zip(polygon.vertices, polygon.loop_indices):
-                    if vertex_index >= len(color_data):
-                        continue
-                        
-                    color = color_data[vertex_index]
-                    vertex_color.data[loop_index].color = color[0] / 255, color[1] / 255, color[2] / 255, color[3] / 255
+            loops = imported_mesh.data.loops
+            vertices = np.empty(len(loops), dtype=np.int32)
+            loops.foreach_get("vertex_index", vertices)
+
+            # corners of vertices without an override color keep the attribute's default
+            colors = np.empty((len(loops), 4), dtype=np.float32)
+            vertex_color.data.foreach_get("color", colors.ravel())
+            has_color = vertices < len(color_data)
+            colors[has_color] = color_data[vertices[has_color]]
+            vertex_color.data.foreach_set("color", colors.ravel())
 
         imported_object.parent = parent
         imported_object.rotation_euler = make_euler(mesh.get("Rotation"))
@@ -294,7 +415,9 @@ class ImportContext:
             self.import_model(child, parent=imported_object)
             
         instances = mesh.get("Instances")
-        if len(instances) > 0:
+        if len(instances) > 0 and EInstanceType(self.options.get("InstanceType")) == EInstanceType.POINT_CLOUD:
+            self.import_point_instances(mesh, instances, imported_object, parent)
+        elif len(instances) > 0:
             mesh_data = imported_mesh.data
             imported_object.select_set(True)
             bpy.ops.object.delete()
@@ -321,6 +444,45 @@ class ImportContext:
             
         return imported_object
     
+    # one point per instance on a single object, the source object is kept hidden and instanced onto the points
+    def import_point_instances(self, mesh, instances, source_object, parent=None):
+        name = mesh.get("Name")
+        Log.info(f"Importing {len(instances)} Instances: {name}")
+
+        source_object.hide_set(True)
+        source_object.hide_render = True
+
+        locations = np.array([(transform["Location"]["X"], transform["Location"]["Y"], transform["Location"]["Z"])
+                              for transform in instances], dtype=np.float32)
+        locations *= (self.scale, -self.scale, self.scale)
+
+        rotations = np.radians(np.array([(transform["Rotation"]["Roll"], transform["Rotation"]["Pitch"], transform["Rotation"]["Yaw"])
+                                         for transform in instances], dtype=np.float32))
+        rotations *= (1, -1, -1)
+
+        scales = np.array([(transform["Scale"]["X"], transform["Scale"]["Y"], transform["Scale"]["Z"])
+                           for transform in instances], dtype=np.float32)
+
+        points_data = bpy.data.meshes.new("Instances_" + name)
+        points_data.vertices.add(len(instances))
+        points_data.vertices.foreach_set("co", locations.ravel())
+        points_data.attributes.new("instance_rotation", "FLOAT_VECTOR", "POINT").data.foreach_set("vector", rotations.ravel())
+        points_data.attributes.new("instance_scale", "FLOAT_VECTOR", "POINT").data.foreach_set("vector", scales.ravel())
+        points_data.update()
+
+        instancer = bpy.data.objects.new("Instances_" + name, points_data)
+        instancer.parent = parent
+        instancer.rotation_euler = make_euler(mesh.get("Rotation"))
+        instancer.location = make_vector(mesh.get("Location"), unreal_coords_correction=True) * self.scale
+        instancer.scale = make_vector(mesh.get("Scale"))
+        self.collection.objects.link(instancer)
+
+        instancer_modifier = instancer.modifiers.new("FP Instancer", type="NODES")
+        instancer_modifier.node_group = get_instancer_node_group()
+        set_geo_nodes_param(instancer_modifier, "Object", source_object)
+
+        return instancer
+
     def import_light_data(self, lights, parent=None):
         if not lights:
             return
@@ -347,33 +509,81 @@ class ImportContext:
         light_data.shadow_soft_size = point_light.get("Radius") * self.scale
         light_data.use_shadow = point_light.get("CastShadows")
 
-    def import_mesh(self, path: str, can_reorient=True):
-        options = UEModelOptions(scale_factor=self.scale,
-                                 reorient_bones=self.options.get("ReorientBones") and can_reorient,
-                                 bone_length=self.options.get("BoneLength"),
-                                 import_sockets=self.options.get("ImportSockets"),
-                                 import_virtual_bones=self.options.get("ImportVirtualBones"),
-                                 import_collision=self.options.get("ImportCollision"),
-                                 target_lod=self.options.get("TargetLOD"),
-                                 allowed_reorient_children=allowed_reorient_children)
+    # keyed by pointer so checking whether a mesh still needs post processing doesn't scan the whole list
+    def add_pending_mesh(self, mesh_data):
+        self.pending_meshes[mesh_data.as_pointer()] = mesh_data
 
+    # normals and quad conversion for every mesh imported since the last call, done in one pass at the data level
+    def post_process_meshes(self):
+        meshes = list(self.pending_meshes.values())
+        self.pending_meshes = {}
+        if len(meshes) == 0:
+            return
+
+        start_time = time.perf_counter()
+        for mesh_data in meshes:
+            set_normals_from_faces(mesh_data)
+        Log.info(f"Set normals from faces for {len(meshes)} meshes in {time.perf_counter() - start_time:.2f}s")
+
+        if EPolygonType(self.options.get("PolygonType")) == EPolygonType.QUADS:
+            start_time = time.perf_counter()
+            for mesh_data in meshes:
+                convert_tris_to_quads(mesh_data)
+            Log.info(f"Converted {len(meshes)} meshes to quads in {time.perf_counter() - start_time:.2f}s")
+
+    def get_model_options(self, can_reorient=True):
+        return UEModelOptions(scale_factor=self.scale,
+                              reorient_bones=self.options.get("ReorientBones") and can_reorient,
+                              bone_length=self.options.get("BoneLength"),
+                              import_sockets=self.options.get("ImportSockets"),
+                              import_virtual_bones=self.options.get("ImportVirtualBones"),
+                              import_collision=self.options.get("ImportCollision"),
+                              target_lod=self.options.get("TargetLOD"),
+                              allowed_reorient_children=allowed_reorient_children,
+                              cache_directory=self.cache_directory)
+
+    # meshes are only shared between the instances of world and prefab exports, and the file's size and modification
+    # time are part of the key so a re-exported asset is imported again
+    def get_registry_key(self, path: str):
+        if self.type not in [EExportType.WORLD, EExportType.PREFAB]:
+            return None
+
+        mesh_path = self.get_mesh_path(path)
+        try:
+            stat = os.stat(mesh_path)
+        except OSError:
+            return None
+
+        return "|".join([
+            mesh_path,
+            str(stat.st_size),
+            str(stat.st_mtime_ns),
+            f"LOD{self.options.get('TargetLOD')}",
+            str(self.scale),
+            EPolygonType(self.options.get("PolygonType")).name,
+            str(bool(self.options.get("ImportCollision"))),
+        ])
+
+    def get_mesh_path(self, path: str):
         path = path[1:] if path.startswith("/") else path
+        return os.path.join(self.assets_root, path.split(".")[0] + ".uemodel")
 
-        mesh_path = os.path.join(self.assets_root, path.split(".")[0] + ".uemodel")
+    def import_mesh(self, path: str, can_reorient=True):
+        mesh_path = self.get_mesh_path(path)
+        model_import = UEFormatImport(self.get_model_options(can_reorient))
 
-        mesh, mesh_data = UEFormatImport(options).import_file(mesh_path)
+        if self.prefetcher is not None and (asset := self.prefetcher.take(mesh_path)):
+            mesh, mesh_data = model_import.import_asset(asset)
+        else:
+            mesh, mesh_data = model_import.import_file(mesh_path)
 
         if mesh is None:
-            return mesh
+            return mesh, mesh_data
 
         if imported_mesh := get_armature_mesh(mesh):
-            bpy.context.view_layer.objects.active = imported_mesh
-            bpy.ops.object.editmode_toggle()
-            bpy.ops.mesh.select_all(action='SELECT')
-            bpy.ops.mesh.set_normals_from_faces()
-            bpy.ops.object.editmode_toggle()
+            self.add_pending_mesh(imported_mesh.data)
             
-        return mesh
+        return mesh, mesh_data
     
     def import_texture_data(self, data):
         import_method = ETextureImportMethod(self.options.get("TextureImportMethod"))
@@ -424,19 +634,63 @@ class ImportContext:
         if existing := bpy.data.images.get(name):
             return existing
 
-        if not os.path.exists(path):
+        if not self.image_paths.get(path, False) and not os.path.exists(path):
             return None
 
         return bpy.data.images.load(path, check_existing=True)
 
-    def import_material(self, material_slot, material_data, meta, as_material_data=False):
+    # built from bpy.data.materials on first use and kept up to date as materials are created
+    def get_material_by_hash(self, material_hash):
+        if self.material_index is None:
+            self.material_index = {}
+            for material in bpy.data.materials:
+                if material.library is None and LEGACY_TEMPLATE_KEY_PROPERTY in material:
+                    del material[LEGACY_TEMPLATE_KEY_PROPERTY]
+
+                if (existing_hash := material.get("Hash")) is not None:
+                    self.material_index.setdefault(existing_hash, material)
+
+        material = self.material_index.get(material_hash)
+        try:
+            # materials replaced by a template copy are removed, drop them from the index
+            if material is not None and material.name:
+                return material
+        except ReferenceError:
+            del self.material_index[material_hash]
 
-        # object ref mat slots for instancing
-        if not as_material_data:
-            temp_material = material_slot.material
-            material_slot.link = 'OBJECT' if self.type in [EExportType.WORLD, EExportType.PREFAB] else 'DATA'
-            material_slot.material = temp_material
+        return None
+
+    # templates are only tracked for this export, one that was removed since it was stored isn't used
+    def get_material_template(self, template_key):
+        if (template := self.material_templates.get(template_key)) is None:
+            return None
+
+        try:
+            if template.name:
+                return template
+        except ReferenceError:
+            pass
 
+        del self.material_templates[template_key]
+        return None
+
+    def add_material_template(self, template_key, material):
+        self.material_templates[template_key] = material
+        self.material_template_keys[material.as_pointer()] = template_key
+
+    # a template rebuilt for another layout can't be copied for the one it was stored under anymore
+    def forget_material_template(self, material, template_key):
+        previous_key = self.material_template_keys.get(material.as_pointer())
+        if previous_key is not None and previous_key != template_key:
+            del self.material_template_keys[material.as_pointer()]
+            if self.material_templates.get(previous_key) == material:
+                del self.material_templates[previous_key]
+
+    def get_override_parameters(self, material_name):
+        return where(self.override_parameters, lambda param: param.get("MaterialNameToAlter") in [material_name, "Global"])
+
+    # texture data and override parameters change the material, so they're part of its hash and name
+    def get_material_hash(self, material_data, meta):
         material_name = material_data.get("Name")
         material_hash = material_data.get("Hash")
         additional_hash = 0
@@ -445,8 +699,8 @@ class ImportContext:
         if texture_data is not None:
             for data in texture_data:
                 additional_hash += data.get("Hash")
-        
-        override_parameters = where(self.override_parameters, lambda param: param.get("MaterialNameToAlter") in [material_name, "Global"])
+
+        override_parameters = self.get_override_parameters(material_name)
         if override_parameters is not None:
             for parameters in override_parameters:
                 additional_hash += parameters.get("Hash")
@@ -454,14 +708,30 @@ class ImportContext:
         if additional_hash != 0:
             material_hash += additional_hash
             material_name += f"_{hash_code(material_hash)}"
+
+        return material_name, material_hash
+
+    def import_material(self, material_slot, material_data, meta, as_material_data=False):
+
+        # object ref mat slots for instancing
+        if not as_material_data:
+            temp_material = material_slot.material
+            # slots of objects sharing a registry mesh are already object linked and have to stay that way
+            is_object_linked = material_slot.link == 'OBJECT' or self.type in [EExportType.WORLD, EExportType.PREFAB]
+            material_slot.link = 'OBJECT' if is_object_linked else 'DATA'
+            material_slot.material = temp_material
+
+        material_name, material_hash = self.get_material_hash(material_data, meta)
+        texture_data = meta.get("TextureData")
+        override_parameters = self.get_override_parameters(material_data.get("Name"))
             
-        if existing_material := first(bpy.data.materials, lambda mat: mat.get("Hash") == hash_code(material_hash)):
+        if existing_material := self.get_material_by_hash(hash_code(material_hash)):
             if not as_material_data:
                 material_slot.material = existing_material
                 return
 
         # same name but different hash
-        if (name_existing := first(bpy.data.materials, lambda mat: mat.name == material_name)) and name_existing.get("Hash") != material_hash:
+        if (name_existing := bpy.data.materials.get(material_name)) and name_existing.get("Hash") != material_hash:
             material_name += f"_{hash_code(material_hash)}"
             
         if not as_material_data and material_slot.material.name.casefold() != material_name.casefold():
@@ -470,15 +740,9 @@ class ImportContext:
         if not as_material_data:
             material_slot.material["Hash"] = hash_code(material_hash)
             material_slot.material["OriginalName"] = material_data.get("Name")
+            self.material_index.setdefault(material_slot.material["Hash"], material_slot.material)
 
         material = bpy.data.materials.new(material_name) if as_material_data else material_slot.material
-        material.use_nodes = True
-        material.surface_render_method = "DITHERED"
-
-        nodes = material.node_tree.nodes
-        nodes.clear()
-        links = material.node_tree.links
-        links.clear()
 
         override_blend_mode = EBlendMode(material_data.get("OverrideBlendMode"))
         base_blend_mode = EBlendMode(material_data.get("BaseBlendMode"))
@@ -508,17 +772,140 @@ class ImportContext:
                 for vector in parameters.get("Vectors"):
                     replace_or_add_parameter(vectors, vector)
 
-        output_node = nodes.new(type="ShaderNodeOutputMaterial")
-        output_node.location = (200, 0)
+        # decide which material type and mappings to use
+        shader_name = "MR Material Lite"
+        socket_mappings = default_mappings
+        base_material_path = material_data.get("BaseMaterialPath")
 
-        shader_node = nodes.new(type="ShaderNodeGroup")
-        shader_node.node_tree = bpy.data.node_groups.get("MR Material Lite")
+        if get_param_multiple(switches, layer_switch_names) and get_param_multiple(textures, extra_layer_names):
+            shader_name = "FP Layer"
+            socket_mappings = layer_mappings
 
-        def replace_shader_node(name):
-            nonlocal shader_node
-            nodes.remove(shader_node)
-            shader_node = nodes.new(type="ShaderNodeGroup")
-            shader_node.node_tree = bpy.data.node_groups.get(name)
+        is_glass = material_data.get("PhysMaterialName") == "Glass" or any(glass_master_names, lambda x: x in base_material_path) or (base_blend_mode is EBlendMode.BLEND_Translucent and translucency_lighting_mode in [ETranslucencyLightingMode.TLM_SurfacePerPixelLighting, ETranslucencyLightingMode.TLM_VolumetricPerVertexDirectional])
+        if is_glass:
+            shader_name = "FP Glass"
+            socket_mappings = glass_mappings
+
+        # TODO: Proper cape/two sided material handling
+        if any(hero_master_names, lambda x: x in base_material_path):
+            shader_name = "MR Hero"
+            socket_mappings = hero_mappings
+
+        if "Hair" in base_material_path:
+            shader_name = "MR Hair"
+            socket_mappings = hair_mappings
+
+        # TODO: Come back to FakeEyeShadow, verify translucent coverage
+        if "Translucent" in base_material_path or "FakeEyeShadow" in base_material_path:
+            shader_name = "MR Translucent"
+            socket_mappings = translucent_mappings
+
+        if "Common_Eye" in base_material_path or "Eye_Opt" in base_material_path:
+            shader_name = "MR Eye"
+            socket_mappings = eye_mappings
+
+        if any(eye_glass_master_names, lambda x: x in base_material_path) or (self.type == EExportType.OUTFIT and "SimpleGlass" in base_material_path):
+            shader_name = "MR Eye Glass"
+            socket_mappings = eye_glass_mappings
+
+        if "RimOnly" in base_material_path:
+            shader_name = "MR Rim"
+        
+        # TODO: Common_Cape, Symbiote (1035)
+        # Cloak, Punisher
+
+        is_vertex_crunch = any(vertex_crunch_names, lambda x: x.lower() in material_name.lower()) or get_param(scalars, "HT_CrunchVerts") == 1 or any(toon_outline_names, lambda x: x in material_name)
+
+        # malformed texture paths skip that texture instead of failing the whole material
+        def get_texture_name(path):
+            parts = path.split(".") if isinstance(path, str) else []
+            return parts[1] if len(parts) == 2 else None
+
+        def get_texture_template_key(texture):
+            path = texture.get("Value")
+            if (texture_name := get_texture_name(path)) is None:
+                return texture.get("Name"), None, False
+
+            return texture.get("Name"), texture_name in texture_ignore_names, self.import_image(path) is not None
+
+        # materials with the same shader and parameter layout only differ in images and values, so after the first
+        # one is built the rest are copied from it and only have those patched in
+        template_key = (
+            shader_name,
+            # glass sets material settings that copies don't reset, and later shaders can replace the glass one
+            is_glass,
+            is_vertex_crunch,
+            bool(get_param(switches, "UseDyeing")),
+            bool(get_param(switches, "Use Diffuse Texture for Color [ignores alpha channel]")),
+            tuple(get_texture_template_key(texture) for texture in textures),
+            tuple(scalar.get("Name") for scalar in scalars),
+            tuple(vector.get("Name") for vector in vectors),
+            tuple(component_mask.get("Name") for component_mask in component_masks),
+            tuple(switch.get("Name") for switch in switches),
+        )
+
+        self.forget_material_template(material, template_key)
+
+        # the template's nodes are copied into this material rather than swapping in a copy of the template, so
+        # the datablock already in the slot stays the one everything else refers to
+        template = self.get_material_template(template_key)
+        is_template_copy = template is not None and template != material
+
+        material.use_nodes = True
+        material.surface_render_method = "DITHERED"
+
+        if is_template_copy:
+            copy_node_tree(template.node_tree, material.node_tree)
+        else:
+            self.add_material_template(template_key, material)
+
+        nodes = material.node_tree.nodes
+        links = material.node_tree.links
+        if is_template_copy:
+            existing_nodes = {node.name: node for node in nodes}
+        else:
+            nodes.clear()
+            links.clear()
+
+        node_name_counts = {}
+
+        # nodes get names derived from what they're for so a copied template can find them again
+        def new_node(node_type, name):
+            name = name[:56]
+            count = node_name_counts.get(name, 0)
+            node_name_counts[name] = count + 1
+            if count > 0:
+                name = f"{name} {count}"
+
+            if is_template_copy and (node := existing_nodes.get(name)):
+                return node, False
+
+            node = nodes.new(type=node_type)
+            node.name = name
+            return node, True
+
+        # copies keep the template's links and only get the ones it's missing, so a layout the key doesn't tell apart
+        # still ends up wired like a fresh build
+        def link(from_socket, to_socket):
+            if is_template_copy and any(node_link.from_socket == from_socket for node_link in to_socket.links):
+                return
+
+            links.new(from_socket, to_socket)
+
+        output_node, created = new_node("ShaderNodeOutputMaterial", "Output")
+        if created:
+            output_node.location = (200, 0)
+
+        shader_node, created = new_node("ShaderNodeGroup", "Shader")
+        if created:
+            shader_node.node_tree = bpy.data.node_groups.get(shader_name)
+
+        if shader_name == "FP Layer":
+            shader_node.inputs["Is Transparent"].default_value = override_blend_mode is not EBlendMode.BLEND_Opaque
+
+        if is_glass:
+            material.surface_render_method = "BLENDED"
+            material.show_transparent_back = False
             
         # for cleaner code sometimes bc stuff gets repetitive
         def set_param(name, value, override_shader=None):
@@ -541,39 +928,45 @@ class ImportContext:
             try:
                 name = data.get("Name")
                 path = data.get("Value")
-                texture_name = path.split(".")[1]
+                if (texture_name := get_texture_name(path)) is None:
+                    return
+
+                mappings = target_mappings.texture_lookup.get(name.casefold())
+                is_unused = mappings is None or texture_name in texture_ignore_names
+                if is_unused and not add_unused_params:
+                    return
 
-                node = nodes.new(type="ShaderNodeTexImage")
+                node, created = new_node("ShaderNodeTexImage", f"Texture {target_node.name} {name}")
                 node.image = self.import_image(path)
                 node.image.alpha_mode = 'CHANNEL_PACKED'
                 node.image.colorspace_settings.name = "sRGB" if data.get("sRGB") else "Non-Color"
-                node.interpolation = "Smart"
-                node.hide = True
+                if created:
+                    node.interpolation = "Smart"
+                    node.hide = True
 
-                mappings = first(target_mappings.textures, lambda x: x.name.casefold() == name.casefold())
-                if mappings is None or texture_name in texture_ignore_names:
-                    if add_unused_params:
-                        nonlocal unused_parameter_height
+                if is_unused:
+                    nonlocal unused_parameter_height
+                    if created:
                         node.label = name
                         node.location = 400, unused_parameter_height
-                        unused_parameter_height -= 50
-                    else:
-                        nodes.remove(node)
+                    unused_parameter_height -= 50
                     return
 
-                x, y = get_socket_pos(target_node, target_node.inputs.find(mappings.slot))
-                node.location = x - 300, y
-                links.new(node.outputs[0], target_node.inputs[mappings.slot])
+                if created:
+                    x, y = get_socket_pos(target_node, target_node.inputs.find(mappings.slot))
+                    node.location = x - 300, y
+                link(node.outputs[0], target_node.inputs[mappings.slot])
 
                 if mappings.alpha_slot:
-                    links.new(node.outputs[1], target_node.inputs[mappings.alpha_slot])
+                    link(node.outputs[1], target_node.inputs[mappings.alpha_slot])
                 if mappings.switch_slot:
                     target_node.inputs[mappings.switch_slot].default_value = 1 if value else 0
                 if mappings.coords != "UV0":
-                    uv = nodes.new(type="ShaderNodeUVMap")
-                    uv.location = node.location.x - 250, node.location.y
-                    uv.uv_map = mappings.coords
-                    links.new(uv.outputs[0], node.inputs[0])
+                    uv, created = new_node("ShaderNodeUVMap", f"{node.name} UV")
+                    if created:
+                        uv.location = node.location.x - 250, node.location.y
+                        uv.uv_map = mappings.coords
+                    link(uv.outputs[0], node.inputs[0])
             except KeyError:
                 nodes.remove(node)
                 pass
@@ -585,15 +978,16 @@ class ImportContext:
                 name = data.get("Name")
                 value = data.get("Value")
 
-                mappings = first(target_mappings.scalars, lambda x: x.name.casefold() == name.casefold())
+                mappings = target_mappings.scalar_lookup.get(name.casefold())
                 if mappings is None:
                     if add_unused_params:
                         nonlocal unused_parameter_height
-                        node = nodes.new(type="ShaderNodeValue")
+                        node, created = new_node("ShaderNodeValue", f"Scalar {name}")
                         node.outputs[0].default_value = value
-                        node.label = name
-                        node.width = 250
-                        node.location = 400, unused_parameter_height
+                        if created:
+                            node.label = name
+                            node.width = 250
+                            node.location = 400, unused_parameter_height
                         unused_parameter_height -= 100
                     return
 
@@ -620,15 +1014,16 @@ class ImportContext:
                 name = data.get("Name")
                 value = data.get("Value")
 
-                mappings = first(target_mappings.vectors, lambda x: x.name.casefold() == name.casefold())
+                mappings = target_mappings.vector_lookup.get(name.casefold())
                 if mappings is None:
                     if add_unused_params:
                         nonlocal unused_parameter_height
-                        node = nodes.new(type="ShaderNodeRGB")
+                        node, created = new_node("ShaderNodeRGB", f"Vector {name}")
                         node.outputs[0].default_value = (value["R"], value["G"], value["B"], value["A"])
-                        node.label = name
-                        node.width = 250
-                        node.location = 400, unused_parameter_height
+                        if created:
+                            node.label = name
+                            node.width = 250
+                            node.location = 400, unused_parameter_height
                         unused_parameter_height -= 200
                     return
 
@@ -648,15 +1043,16 @@ class ImportContext:
                 name = data.get("Name")
                 value = data.get("Value")
 
-                mappings = first(target_mappings.component_masks, lambda x: x.name.casefold() == name.casefold())
+                mappings = target_mappings.component_mask_lookup.get(name.casefold())
                 if mappings is None:
                     if add_unused_params:
                         nonlocal unused_parameter_height
-                        node = nodes.new(type="ShaderNodeRGB")
+                        node, created = new_node("ShaderNodeRGB", f"Component Mask {name}")
                         node.outputs[0].default_value = (value["R"], value["G"], value["B"], value["A"])
-                        node.label = name
-                        node.width = 250
-                        node.location = 400, unused_parameter_height
+                        if created:
+                            node.label = name
+                            node.width = 250
+                            node.location = 400, unused_parameter_height
                         unused_parameter_height -= 200
                     return
 
@@ -672,16 +1068,18 @@ class ImportContext:
                 name = data.get("Name")
                 value = data.get("Value")
 
-                mappings = first(target_mappings.switches, lambda x: x.name.casefold() == name.casefold())
+                mappings = target_mappings.switch_lookup.get(name.casefold())
                 if mappings is None:
                     if add_unused_params:
                         nonlocal unused_parameter_height
-                        node = nodes.new("ShaderNodeGroup")
-                        node.node_tree = bpy.data.node_groups.get("FP Switch")
+                        node, created = new_node("ShaderNodeGroup", f"Switch {name}")
+                        if created:
+                            node.node_tree = bpy.data.node_groups.get("FP Switch")
                         node.inputs[0].default_value = 1 if value else 0
-                        node.label = name
-                        node.width = 250
-                        node.location = 400, unused_parameter_height
+                        if created:
+                            node.label = name
+                            node.width = 250
+                            node.location = 400, unused_parameter_height
                         unused_parameter_height -= 125
                     return
 
@@ -715,79 +1113,37 @@ class ImportContext:
 
         def move_texture_node(target_node, slot_name):
             if texture_node := get_node(shader_node, slot_name):
-                x, y = get_socket_pos(target_node, target_node.inputs.find(slot_name))
-                texture_node.location = x - 300, y
-                links.new(texture_node.outputs[0], target_node.inputs[slot_name])
-                links.new(target_node.outputs[slot_name], shader_node.inputs[slot_name])
+                # copied templates already have the texture moved in front of the target node
+                if not is_template_copy:
+                    x, y = get_socket_pos(target_node, target_node.inputs.find(slot_name))
+                    texture_node.location = x - 300, y
+                link(texture_node.outputs[0], target_node.inputs[slot_name])
+                link(target_node.outputs[slot_name], shader_node.inputs[slot_name])
                 
         def add_default_texture(texture_name, color_space, target_node, target_slot, pre_node=None, pre_slot=None):
-            default_texture_node = nodes.new(type="ShaderNodeTexImage")
+            default_texture_node, created = new_node("ShaderNodeTexImage", f"Default Texture {target_slot}")
             default_texture_node.image = bpy.data.images.get(texture_name)
             default_texture_node.image.alpha_mode = 'CHANNEL_PACKED'
             default_texture_node.image.colorspace_settings.name = color_space
-            default_texture_node.interpolation = "Smart"
-            default_texture_node.hide = True
-
-            x, y = get_socket_pos(shader_node, shader_node.inputs.find(target_slot))
-            default_texture_node.location = x - 300, y
-            links.new(default_texture_node.outputs[0], target_node.inputs[target_slot])
-
-            if pre_node is not None:
-                links.new(pre_node.outputs[pre_slot], default_texture_node.inputs[0])
-
-        # decide which material type and mappings to use
-        socket_mappings = default_mappings
-        base_material_path = material_data.get("BaseMaterialPath")
-
-        if get_param_multiple(switches, layer_switch_names) and get_param_multiple(textures, extra_layer_names):
-            replace_shader_node("FP Layer")
-            socket_mappings = layer_mappings
+            if created:
+                default_texture_node.interpolation = "Smart"
+                default_texture_node.hide = True
 
-            set_param("Is Transparent", override_blend_mode is not EBlendMode.BLEND_Opaque)
+                x, y = get_socket_pos(shader_node, shader_node.inputs.find(target_slot))
+                default_texture_node.location = x - 300, y
 
-        is_glass = material_data.get("PhysMaterialName") == "Glass" or any(glass_master_names, lambda x: x in base_material_path) or (base_blend_mode is EBlendMode.BLEND_Translucent and translucency_lighting_mode in [ETranslucencyLightingMode.TLM_SurfacePerPixelLighting, ETranslucencyLightingMode.TLM_VolumetricPerVertexDirectional])
-        if is_glass:
-            replace_shader_node("FP Glass")
-            socket_mappings = glass_mappings
-
-            material.surface_render_method = "BLENDED"
-            material.show_transparent_back = False
+            link(default_texture_node.outputs[0], target_node.inputs[target_slot])
 
-        # TODO: Proper cape/two sided material handling
-        if any(hero_master_names, lambda x: x in base_material_path):
-            replace_shader_node("MR Hero")
-            socket_mappings = hero_mappings
-
-        if "Hair" in base_material_path:
-            replace_shader_node("MR Hair")
-            socket_mappings = hair_mappings
-
-        # TODO: Come back to FakeEyeShadow, verify translucent coverage
-        if "Translucent" in base_material_path or "FakeEyeShadow" in base_material_path:
-            replace_shader_node("MR Translucent")
-            socket_mappings = translucent_mappings
-
-        if "Common_Eye" in base_material_path or "Eye_Opt" in base_material_path:
-            replace_shader_node("MR Eye")
-            socket_mappings = eye_mappings
-
-        if any(eye_glass_master_names, lambda x: x in base_material_path) or (self.type == EExportType.OUTFIT and "SimpleGlass" in base_material_path):
-            replace_shader_node("MR Eye Glass")
-            socket_mappings = eye_glass_mappings
-
-        if "RimOnly" in base_material_path:
-            replace_shader_node("MR Rim")
-        
-        # TODO: Common_Cape, Symbiote (1035)
-        # Cloak, Punisher
+            if pre_node is not None:
+                link(pre_node.outputs[pre_slot], default_texture_node.inputs[0])
 
         setup_params(socket_mappings, shader_node, True)
 
-        links.new(shader_node.outputs[0], output_node.inputs[0])
+        link(shader_node.outputs[0], output_node.inputs[0])
 
         # post parameter handling
         
-        if any(vertex_crunch_names, lambda x: x.lower() in material_name.lower()) or get_param(scalars, "HT_CrunchVerts") == 1 or any(toon_outline_names, lambda x: x in material_name):
+        if is_vertex_crunch:
             self.full_vertex_crunch_materials.append(material)
             return
 
@@ -813,45 +1169,47 @@ class ImportContext:
                 self.add_toon_outline = True
             
             case "MR Eye":
-                pre_eye_node = nodes.new(type="ShaderNodeGroup")
-                pre_eye_node.node_tree = bpy.data.node_groups.get("MR Pre Eye")
-                pre_eye_node.location = -600, -100
+                pre_eye_node, created = new_node("ShaderNodeGroup", "Pre Eye")
+                if created:
+                    pre_eye_node.node_tree = bpy.data.node_groups.get("MR Pre Eye")
+                    pre_eye_node.location = -600, -100
                 setup_params(pre_eye_mappings, pre_eye_node, False)
 
                 if node := get_node(shader_node, "ScleraBaseColor"):
-                    links.new(pre_eye_node.outputs["Sclera UV"], node.inputs[0])
+                    link(pre_eye_node.outputs["Sclera UV"], node.inputs[0])
                 else:
                     add_default_texture("T_EyeSclera_D", "sRGB", shader_node, "ScleraBaseColor", pre_eye_node, "Sclera UV")
                     
                 if node := get_node(shader_node, "IrisBaseColor"):
-                    links.new(pre_eye_node.outputs["Iris UV"], node.inputs[0])
+                    link(pre_eye_node.outputs["Iris UV"], node.inputs[0])
                 else:
                     add_default_texture("T_Common_Eyes_03_D", "sRGB", shader_node, "IrisBaseColor", pre_eye_node, "Iris UV")
 
                 if node := get_node(shader_node, "IrisHeight"):
-                    links.new(pre_eye_node.outputs["Iris UV"], node.inputs[0])
+                    link(pre_eye_node.outputs["Iris UV"], node.inputs[0])
                 else:
                     add_default_texture("T_Iris001_01_H", "Non-Color", shader_node, "IrisHeight", pre_eye_node, "Iris UV")
 
                 if node := get_node(shader_node, "IrisBaseAO"):
-                    links.new(pre_eye_node.outputs["Iris UV"], node.inputs[0])
+                    link(pre_eye_node.outputs["Iris UV"], node.inputs[0])
                 else:
                     add_default_texture("T_Iris001_01_AO", "sRGB", shader_node, "IrisBaseAO", pre_eye_node, "Iris UV")
 
-                links.new(pre_eye_node.outputs["Sclera UV"], shader_node.inputs["Sclera UV"])
-                links.new(pre_eye_node.outputs["Iris UV"], shader_node.inputs["Iris UV"])
+                link(pre_eye_node.outputs["Sclera UV"], shader_node.inputs["Sclera UV"])
+                link(pre_eye_node.outputs["Iris UV"], shader_node.inputs["Iris UV"])
 
                 if diffuse_node := get_node(shader_node, "ScleraBaseColor"):
                     nodes.active = diffuse_node
             
             case "MR Eye Glass":
-                pre_eye_glass_node = nodes.new(type="ShaderNodeGroup")
-                pre_eye_glass_node.node_tree = bpy.data.node_groups.get("MR Pre Eye Glass")
-                pre_eye_glass_node.location = -500, -75
+                pre_eye_glass_node, created = new_node("ShaderNodeGroup", "Pre Eye Glass")
+                if created:
+                    pre_eye_glass_node.node_tree = bpy.data.node_groups.get("MR Pre Eye Glass")
+                    pre_eye_glass_node.location = -500, -75
                 setup_params(pre_eye_glass_mappings, pre_eye_glass_node, False)
 
                 if node := get_node(shader_node, "HighlightMask"):
-                    links.new(pre_eye_glass_node.outputs["Highlight UV"], node.inputs[0])
+                    link(pre_eye_glass_node.outputs["Highlight UV"], node.inputs[0])
                 else:
                     add_default_texture("T_Common_EyesHighLight_01_M", "sRGB", shader_node, "HighlightMask", pre_eye_glass_node, "Highlight UV")
 
@@ -867,9 +1225,10 @@ class ImportContext:
                     nodes.active = diffuse_node
                     
                 if get_param(switches, "UseDyeing"):
-                    dye_node = nodes.new(type="ShaderNodeGroup")
-                    dye_node.node_tree = bpy.data.node_groups.get("MR ColorID Dye")
-                    dye_node.location = -500, -75
+                    dye_node, created = new_node("ShaderNodeGroup", "ColorID Dye")
+                    if created:
+                        dye_node.node_tree = bpy.data.node_groups.get("MR ColorID Dye")
+                        dye_node.location = -500, -75
                     setup_params(dye_mat_mappings, dye_node, False)
                     
                     move_texture_node(dye_node, "BaseColor")
@@ -1179,6 +1538,8 @@ class ImportContext:
                     mesh_track.name = "Sections"
                     import_sections(anims, mesh, mesh_track)
 
+            self.post_process_meshes()
+
             master_skeleton.hide_set(True)
 
         if self.options.get("ImportSounds"):
@@ -1196,7 +1557,8 @@ class ImportContext:
         options = UEAnimOptions(link=False,
                                 override_skeleton=override_skeleton,
                                 scale_factor=self.scale,
-                                import_curves=False)
+                                import_curves=False,
+                                cache_directory=self.cache_directory)
         action, anim_data = UEFormatImport(options).import_file(anim_path)
         action["Skeleton"] = override_skeleton.name
         action["HasCurves"] = len(anim_data.curves) > 0
@@ -1222,7 +1584,8 @@ class ImportContext:
 
         options = UEPoseOptions(scale_factor=self.scale,
                                 override_skeleton=override_skeleton,
-                                root_bone="neck_01")
+                                root_bone="neck_01",
+                                cache_directory=self.cache_directory)
 
         UEFormatImport(options).import_file(pose_path)
         
@@ -6,6 +6,20 @@ class MappingCollection:
         self.switches = switches
         self.component_masks = component_masks
 
+        # casefolded name -> mapping, the first mapping listed for a name wins like the old linear search
+        self.texture_lookup = self.build_lookup(textures)
+        self.scalar_lookup = self.build_lookup(scalars)
+        self.vector_lookup = self.build_lookup(vectors)
+        self.switch_lookup = self.build_lookup(switches)
+        self.component_mask_lookup = self.build_lookup(component_masks)
+
+    @staticmethod
+    def build_lookup(mappings):
+        lookup = {}
+        for mapping in mappings:
+            lookup.setdefault(mapping.name.casefold(), mapping)
+        return lookup
+
 
 class SlotMapping:
     def __init__(self, name, slot=None, alpha_slot=None, switch_slot=None, value_func=None, coords="UV0"):
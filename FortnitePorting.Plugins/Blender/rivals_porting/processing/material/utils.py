@@ -1,15 +1,28 @@
+from functools import lru_cache
 from ...utils import *
 
 
+# the name lists are module constants, so their casefolded sets only need to be built once
+def casefold_names(names):
+    return casefold_name_set(tuple(names))
+
+
+@lru_cache(maxsize=None)
+def casefold_name_set(names):
+    return frozenset(name.casefold() for name in names)
+
+
 def get_param(source, name):
-    found = first(source, lambda param: param.get("Name").casefold() == name.casefold())
+    name = name.casefold()
+    found = first(source, lambda param: param.get("Name").casefold() == name)
     if found is None:
         return None
     return found.get("Value")
 
 
 def get_vector_param(source, name):
-    found = first(source, lambda param: param.get("Name").casefold() == name.casefold())
+    name = name.casefold()
+    found = first(source, lambda param: param.get("Name").casefold() == name)
     if found is None:
         return None
     found_value = found.get("Value")
@@ -17,21 +30,24 @@ def get_vector_param(source, name):
 
 
 def get_param_multiple(source, names):
-    found = first(source, lambda param: param.get("Name").casefold() in [name.casefold() for name in names])
+    names = casefold_names(names)
+    found = first(source, lambda param: param.get("Name").casefold() in names)
     if found is None:
         return None
     return found.get("Value")
 
 
 def get_param_info(source, name):
-    found = first(source, lambda param: param.get("Name").casefold() == name.casefold())
+    name = name.casefold()
+    found = first(source, lambda param: param.get("Name").casefold() == name)
     if found is None:
         return None
     return found
 
 
 def get_params(source, names):
-    return [info.get("Value") for info in where(source, lambda param: param.get("Name").casefold() in [name.casefold() for name in names])]
+    names = casefold_names(names)
+    return [info.get("Value") for info in where(source, lambda param: param.get("Name").casefold() in names)]
 
 
 def get_socket_pos(node, index):
@@ -64,3 +80,48 @@ def get_node(shader_node, name):
         return None
 
     return links[0].from_node
+
+
+# properties that are set separately or can't be written when copying nodes between trees
+skipped_node_properties = {"rna_type", "name", "location", "parent", "select"}
+
+
+def copy_node_tree(source_tree, target_tree):
+    target_tree.nodes.clear()
+
+    sockets = {}
+    for source_node in source_tree.nodes:
+        node = target_tree.nodes.new(type=source_node.bl_idname)
+        node.name = source_node.name
+
+        # group and image pointers have to be set before the sockets they add are copied
+        for prop in source_node.bl_rna.properties:
+            if prop.is_readonly or prop.identifier in skipped_node_properties or prop.identifier.startswith("bl_"):
+                continue
+
+            try:
+                setattr(node, prop.identifier, getattr(source_node, prop.identifier))
+            except (AttributeError, TypeError, ValueError):
+                pass
+
+        for source_sockets, target_sockets in [(source_node.inputs, node.inputs), (source_node.outputs, node.outputs)]:
+            for source_socket, target_socket in zip(source_sockets, target_sockets):
+                sockets[source_socket.as_pointer()] = target_socket
+                target_socket.hide = source_socket.hide
+                if hasattr(source_socket, "default_value"):
+                    target_socket.default_value = source_socket.default_value
+
+    for source_node in source_tree.nodes:
+        node = target_tree.nodes[source_node.name]
+        if source_node.parent is not None:
+            node.parent = target_tree.nodes[source_node.parent.name]
+        node.location = source_node.location
+
+    for source_link in source_tree.links:
+        from_socket = sockets.get(source_link.from_socket.as_pointer())
+        to_socket = sockets.get(source_link.to_socket.as_pointer())
+        if from_socket is not None and to_socket is not None:
+            target_tree.links.new(from_socket, to_socket)
+
+    if source_tree.nodes.active is not None:
+        target_tree.nodes.active = target_tree.nodes.get(source_tree.nodes.active.name)
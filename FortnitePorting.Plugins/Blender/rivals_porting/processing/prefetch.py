@@ -0,0 +1,69 @@
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+READ_CHUNK_SIZE = 1 << 20
+
+
+# parses assets on worker threads ahead of the main thread, which only builds the blender data.
+# only a window of assets is queued at a time so a world export doesn't keep every parsed mesh in memory
+class AssetPrefetcher:
+
+    def __init__(self, parse, paths, max_workers=None):
+        self.parse = parse
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.lookahead = self.max_workers * 2
+        self.pending = deque(dict.fromkeys(paths))
+        self.futures: dict[str, Future] = {}
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="AssetPrefetch")
+        self.fill()
+
+    def fill(self):
+        while self.pending and len(self.futures) < self.lookahead:
+            path = self.pending.popleft()
+            self.futures[path] = self.executor.submit(self.parse, path)
+
+    def take(self, path):
+        if path not in self.futures:
+            if path in self.pending:
+                self.pending.remove(path)
+            return None
+
+        # assets are taken in the order they were queued, anything queued before this one was skipped
+        while True:
+            queued_path, future = next(iter(self.futures.items()))
+            del self.futures[queued_path]
+            if queued_path == path:
+                break
+            future.cancel()
+
+        self.fill()
+        return future.result()
+
+    def shutdown(self):
+        self.pending.clear()
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+        self.executor.shutdown(wait=True)
+
+
+# reads whole files on worker threads so they're in the os file cache by the time blender loads them.
+# returns whether each path exists, missing files are skipped
+def read_files(paths, max_workers=None):
+    def read_file(path):
+        try:
+            with open(path, "rb") as file:
+                while file.read(READ_CHUNK_SIZE):
+                    pass
+            return True
+        except OSError:
+            return False
+
+    paths = list(dict.fromkeys(paths))
+    if len(paths) == 0:
+        return {}
+
+    max_workers = max_workers or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="FileRead") as executor:
+        return dict(zip(paths, executor.map(read_file, paths)))
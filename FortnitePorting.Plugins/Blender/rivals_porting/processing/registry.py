@@ -0,0 +1,26 @@
+import bpy
+
+
+# mesh datablocks imported this session, keyed on the asset and every option that changes its geometry.
+# the key is also stored on the datablock so a renamed or replaced mesh is never picked up by mistake
+class MeshRegistry:
+    KEY_PROPERTY = "AssetRegistryKey"
+
+    meshes: dict[str, str] = {}
+
+    @classmethod
+    def get(cls, key):
+        if (name := cls.meshes.get(key)) is None:
+            return None
+
+        mesh_data = bpy.data.meshes.get(name)
+        if mesh_data is None or mesh_data.get(cls.KEY_PROPERTY) != key:
+            del cls.meshes[key]
+            return None
+
+        return mesh_data
+
+    @classmethod
+    def add(cls, key, mesh_data):
+        mesh_data[cls.KEY_PROPERTY] = key
+        cls.meshes[key] = mesh_data.name
@@ -1,5 +1,7 @@
 import bpy
+import bmesh
 import re
+import numpy as np
 
 from .enums import *
 from ..utils import *
@@ -122,6 +124,34 @@ def get_armature_mesh(obj):
         return obj
     return None
     
+# data level equivalent of mesh.set_normals_from_faces on every face, without going through edit mode
+def set_normals_from_faces(mesh_data):
+    polygons = mesh_data.polygons
+    loops = mesh_data.loops
+
+    face_normals = np.empty(len(polygons) * 3, dtype=np.float32)
+    polygons.foreach_get("normal", face_normals)
+    loop_totals = np.empty(len(polygons), dtype=np.int32)
+    polygons.foreach_get("loop_total", loop_totals)
+    loop_vertices = np.empty(len(loops), dtype=np.int32)
+    loops.foreach_get("vertex_index", loop_vertices)
+
+    vertex_normals = np.zeros((len(mesh_data.vertices), 3), dtype=np.float32)
+    np.add.at(vertex_normals, loop_vertices, np.repeat(face_normals.reshape(-1, 3), loop_totals, axis=0))
+    lengths = np.linalg.norm(vertex_normals, axis=1, keepdims=True)
+    np.divide(vertex_normals, lengths, out=vertex_normals, where=lengths > 0)
+
+    mesh_data.normals_split_custom_set_from_vertices(vertex_normals)
+
+# same as mesh.tris_convert_to_quads(uvs=True) with its default thresholds
+def convert_tris_to_quads(mesh_data):
+    bm = bmesh.new()
+    bm.from_mesh(mesh_data)
+    bmesh.ops.join_triangles(bm, faces=bm.faces[:], cmp_uvs=True,
+                             angle_face_threshold=radians(40), angle_shape_threshold=radians(40))
+    bm.to_mesh(mesh_data)
+    bm.free()
+
 def get_selected_armature():
     selected = bpy.context.active_object
     if selected.type == 'ARMATURE':
@@ -287,4 +317,51 @@ def clear_children_bone_transforms(skeleton, anim, bone_name):
 
 def set_geo_nodes_param(geo_node_modifier, name, value):
     identifier = geo_node_modifier.node_group.interface.items_tree[name].identifier
-    geo_node_modifier[identifier] = value
\ No newline at end of file
+    geo_node_modifier[identifier] = value
+
+INSTANCER_NODE_GROUP = "FP Instancer"
+
+# instances the input object on every point using the instance_rotation and instance_scale point attributes
+def get_instancer_node_group():
+    if node_group := bpy.data.node_groups.get(INSTANCER_NODE_GROUP):
+        return node_group
+
+    node_group = bpy.data.node_groups.new(INSTANCER_NODE_GROUP, "GeometryNodeTree")
+    node_group.interface.new_socket("Geometry", in_out="INPUT", socket_type="NodeSocketGeometry")
+    node_group.interface.new_socket("Object", in_out="INPUT", socket_type="NodeSocketObject")
+    node_group.interface.new_socket("Geometry", in_out="OUTPUT", socket_type="NodeSocketGeometry")
+
+    nodes = node_group.nodes
+    links = node_group.links
+
+    group_input = nodes.new(type="NodeGroupInput")
+    group_input.location = (-600, 0)
+
+    object_info = nodes.new(type="GeometryNodeObjectInfo")
+    object_info.location = (-400, -100)
+    object_info.inputs["As Instance"].default_value = True
+
+    rotation = nodes.new(type="GeometryNodeInputNamedAttribute")
+    rotation.location = (-400, -300)
+    rotation.data_type = "FLOAT_VECTOR"
+    rotation.inputs["Name"].default_value = "instance_rotation"
+
+    scale = nodes.new(type="GeometryNodeInputNamedAttribute")
+    scale.location = (-400, -450)
+    scale.data_type = "FLOAT_VECTOR"
+    scale.inputs["Name"].default_value = "instance_scale"
+
+    instance_on_points = nodes.new(type="GeometryNodeInstanceOnPoints")
+    instance_on_points.location = (-100, 0)
+
+    group_output = nodes.new(type="NodeGroupOutput")
+    group_output.location = (100, 0)
+
+    links.new(group_input.outputs["Geometry"], instance_on_points.inputs["Points"])
+    links.new(group_input.outputs["Object"], object_info.inputs["Object"])
+    links.new(object_info.outputs["Geometry"], instance_on_points.inputs["Instance"])
+    links.new(rotation.outputs["Attribute"], instance_on_points.inputs["Rotation"])
+    links.new(scale.outputs["Attribute"], instance_on_points.inputs["Scale"])
+    links.new(instance_on_points.outputs["Instances"], group_output.inputs["Geometry"])
+
+    return node_group
\ No newline at end of file
@@ -15,6 +15,7 @@ public partial class BlenderSettingsViewModel : BaseExportSettings
     [ObservableProperty] private bool _scaleDown = true;
     [ObservableProperty] private bool _importIntoCollection = true;
     [ObservableProperty] private bool _importAt3DCursor = false;
+    [ObservableProperty] private bool _cacheParsedAssets = false;
     
     // Armature
     [ObservableProperty, NotifyPropertyChangedFor(nameof(IsTastyRig))] private ERigType _rigType = ERigType.Default;
@@ -28,6 +29,7 @@ public partial class BlenderSettingsViewModel : BaseExportSettings
     // Mesh
     [ObservableProperty] private int _targetLOD = 0;
     [ObservableProperty] private EPolygonType _polygonType;
+    [ObservableProperty] private EInstanceType _instanceType = EInstanceType.Objects;
     [ObservableProperty] private bool _importCollision = false;
     
     // Material
@@ -76,6 +78,15 @@ public enum EPolygonType
     Quads
 }
 
+public enum EInstanceType
+{
+    [Description("Objects")]
+    Objects,
+
+    [Description("Point Cloud (Geometry Nodes)")]
+    PointCloud
+}
+
 public enum ETextureImportMethod
 {
     [Description("As Texture Data")]